@@ -44,6 +44,8 @@ ALL_RECORD_ID_FIELDS = [*REQD_RECORD_ID_FIELDS,
                         RECORD_ID.SUFFIX.value,
                         RECORD_ID.INCREMENT.value,
                         RECORD_ID.NAME.value]
+# ALL_RECORD_ID_FIELDS is ordered (it defines the leading CSV columns); use this set for membership tests
+ALL_RECORD_ID_FIELDS_SET = frozenset(ALL_RECORD_ID_FIELDS)
 
 ############################################################
 # Installation types
@@ -94,7 +96,7 @@ class FORMAT(Enum):
     TXT = "txt"  # Text format
     YAML = "yaml"  # YAML text format
 
-DATA_FORMATS = [FORMAT.DF, FORMAT.CSV, FORMAT.LOG]
+DATA_FORMATS = frozenset({FORMAT.DF, FORMAT.CSV, FORMAT.LOG})
 
 ############################################################
 # Tags used in logs sent from sensors to the ETL
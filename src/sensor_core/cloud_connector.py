@@ -1,13 +1,39 @@
+import errno
+import hashlib
+import io
+import os
+import random
 import shutil
+import statistics
+import threading
+from collections import deque
 from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from itertools import islice
 from pathlib import Path
-from queue import Queue
-from time import sleep
-from typing import Optional
-
-from azure.storage.blob import BlobClient, BlobLeaseClient, ContainerClient
+from queue import Empty, SimpleQueue
+from time import monotonic, sleep
+from typing import BinaryIO, Callable, Iterable, Optional
+
+import requests
+from azure.core import MatchConditions
+from azure.core.exceptions import (
+    HttpResponseError,
+    ResourceExistsError,
+    ResourceModifiedError,
+    ResourceNotFoundError,
+)
+from azure.core.pipeline.transport import RequestsTransport
+from azure.core.pipeline.transport._bigger_block_size_http_adapters import BiggerBlockSizeHTTPAdapter
+from azure.storage.blob import (
+    BlobClient,
+    BlobLeaseClient,
+    BlobServiceClient,
+    ContainerClient,
+    StandardBlobTier,
+)
+from urllib3.util.retry import Retry
 
 from sensor_core import api, file_naming
 from sensor_core import configuration as root_cfg
@@ -15,6 +41,17 @@ from sensor_core.configuration import CloudType
 
 logger = root_cfg.setup_logger(name="sensor_core")
 
+# Azure limits a single append_block call to 4MiB; larger appends are split into blocks of up to this
+# size, ending at a line break.
+MAX_APPEND_BLOCK_SIZE: int = 4 * 1024 * 1024
+# Defaults for our shared transport; these match those the Azure Storage SDK applies to the transport 
+# it creates when none is supplied. Responses are read in blocks of TRANSPORT_DATA_BLOCK_SIZE bytes.
+TRANSPORT_CONNECTION_TIMEOUT: int = 20
+TRANSPORT_READ_TIMEOUT: int = 60
+TRANSPORT_DATA_BLOCK_SIZE: int = 256 * 1024
+# Returned by get_blob_modified_time() when the blob does not exist
+DATETIME_MIN_UTC: datetime = datetime.min.replace(tzinfo=timezone.utc)
+
 
 ##########################################################################################################
 
@@ -38,6 +75,35 @@ class CloudConnector:
 
         self._connection_string = root_cfg.keys.cloud_storage_key
 
+        # A single BlobServiceClient owns the HTTP transport; all ContainerClients are derived from it
+        # so that they share its connection pool (and keep-alive connections).
+        self._blob_service = BlobServiceClient.from_connection_string(
+            conn_str=self._get_connection_string(),
+            transport=self._make_transport(),
+            max_block_size=root_cfg.CLOUD_MAX_BLOCK_SIZE,
+            max_single_put_size=root_cfg.CLOUD_MAX_SINGLE_PUT_SIZE,
+            max_single_get_size=root_cfg.CLOUD_MAX_SINGLE_GET_SIZE,
+            max_chunk_get_size=root_cfg.CLOUD_MAX_CHUNK_GET_SIZE,
+            retry_total=root_cfg.CLOUD_RETRY_TOTAL,
+            initial_backoff=root_cfg.CLOUD_RETRY_INITIAL_BACKOFF,
+        )
+
+        # ContainerClients are cached by name so that we don't rebuild them on every call. 
+        # Reads are lock-free; the lock only serialises creation.
+        # Pre-populate with the device's default containers.
+        self._container_clients: dict[str, ContainerClient] = {}
+        self._container_clients_lock = threading.Lock()
+        for container in (root_cfg.my_device.cc_for_upload,
+                          root_cfg.my_device.cc_for_journals,
+                          root_cfg.my_device.cc_for_system_records,
+                          root_cfg.my_device.cc_for_fair):
+            self._make_container(container)
+
+        # Append blobs that we know exist, keyed by "container/blob_name", so that repeat appends
+        # skip the exists() round trip.
+        self._append_exists: set[str] = set()
+        self._append_exists_lock = threading.Lock()
+
     @staticmethod
     def get_instance(type: CloudType) -> "CloudConnector":
         """We use a factory pattern to offer up alternative types of CloudConnector for accessing
@@ -76,6 +142,7 @@ class CloudConnector:
         src_files: list of files to upload to the container
         delete_src: delete the local src_files instances after successful upload; defaults to True
 
+        Files are uploaded in parallel.
         If the upload fails part way through, those files that were successfully uploaded will have
         been deleted (if delete_src=True), while any remaining files in src_files will not have been
         deleted.
@@ -85,21 +152,29 @@ class CloudConnector:
         if not isinstance(src_files, list):
             src_files = [src_files]
 
-        for file in src_files:
-            if file.exists():
-                blob_client = upload_container.get_blob_client(file.name)
-                with open(file, "rb") as data:
-                    blob_client.upload_blob(
-                        data,
-                        overwrite=True,
-                        connection_timeout=600,
-                        standard_blob_tier=storage_tier,
-                    )
-                if delete_src:
-                    logger.debug(f"Deleting uploaded file: {file}")
-                    file.unlink()
-            else:
-                logger.error(f"{root_cfg.RAISE_WARN()}Upload failed because file {file} does not exist")
+        # Resolve the SDK's tier once rather than per file
+        failures = self._upload_files(upload_container, src_files, delete_src, storage_tier.value)
+        if failures:
+            # Re-raise the first failure now that all the uploads have been attempted
+            raise next(iter(failures.values()))
+
+    def make_uploader(
+        self,
+        dst_container: str,
+        storage_tier: api.StorageTier = api.StorageTier.HOT,
+    ) -> Callable[[Path, bool], None]:
+        """Return a function that uploads a single file to dst_container at storage_tier.
+        The function takes (src_file, delete_src) and behaves like upload_to_container() for that file.
+
+        The container and tier are resolved once, so callers that repeatedly upload to the same 
+        destination avoid re-doing that work on every call."""
+        upload_container = self._validate_container(dst_container)
+        blob_tier = storage_tier.value
+
+        def upload(src_file: Path, delete_src: bool) -> None:
+            self._upload_file(upload_container, src_file, delete_src, blob_tier)
+
+        return upload
 
     def download_from_container(
         self, src_container: str, src_file: str, dst_file: Path
@@ -110,11 +185,7 @@ class CloudConnector:
             return
 
         download_container = self._validate_container(src_container)
-
-        blob_client = download_container.get_blob_client(src_file)
-        with open(dst_file, "wb") as my_file:
-            download_stream = blob_client.download_blob()
-            my_file.write(download_stream.readall())
+        self._download_file(download_container, src_file, dst_file)
 
     def download_container(
         self,
@@ -137,43 +208,55 @@ class CloudConnector:
 
         download_container = self._validate_container(src_container)
         original_dst_dir = dst_dir
+        # Each destination directory is created once, rather than checked for every file
+        made_dirs: set[Path] = set()
+
+        def make_dir(dir: Path) -> None:
+            if dir not in made_dirs:
+                dir.mkdir(parents=True, exist_ok=True)
+                made_dirs.add(dir)
 
+        blob_names: Iterable[str]
         if files is None:
-            for blob in download_container.list_blobs():
-                blob_client = download_container.get_blob_client(blob.name)
-                if folder_prefix_len is not None:
-                    dst_dir = original_dst_dir.joinpath(blob.name[:folder_prefix_len])
-                    if not dst_dir.exists():
-                        dst_dir.mkdir(parents=True, exist_ok=True)
-                with open(dst_dir.joinpath(blob.name), "wb") as my_file:
-                    download_stream = blob_client.download_blob()
-                    my_file.write(download_stream.readall())
+            # Download the listing as it is paged in, so that listing and downloading overlap.
+            # We only need the names, so avoid list_blobs() which also fetches all the blob properties
+            blob_names = download_container.list_blob_names(results_per_page=5000)
         else:
-            files_downloaded = 0
-            # Create a pool of threads to download the files
-            with ThreadPoolExecutor(max_workers=8) as executor:
-                futures = []
-                for blob_name in files:
-                    blob_client = download_container.get_blob_client(blob_name)
-                    if folder_prefix_len is not None:
-                        dst_dir = original_dst_dir.joinpath(blob_name[:folder_prefix_len])
-                    dst_file = dst_dir.joinpath(blob_name)
-                    if not overwrite and dst_file.exists():
-                        logger.debug(f"File {dst_file} already exists; skipping download")
-                        continue
-                    futures.append(executor.submit(self._download_file, blob_client, dst_file))
-                    if len(futures) > 10000:
-                        logger.info("Working on batch of 10000 files")
-                        for future in as_completed(futures, timeout=600):
-                            future.result()
-                            files_downloaded += 1
-                        futures = []
-                logger.info(f"Downloading total of {len(futures)} files")
-
-                for future in as_completed(futures, timeout=600):
-                    future.result()
-                    files_downloaded += 1
-                logger.info(f"Completed downloaded of {files_downloaded} files")
+            blob_names = files
+
+        # Bound the number of downloads in flight so that we don't hold a Future for every file in 
+        # a large download. The BlobClient for each file is only created on the worker thread.
+        in_flight = threading.Semaphore(64)
+        failures: list[BaseException] = []
+
+        def download_done(future: Future) -> None:
+            in_flight.release()
+            error = future.exception()
+            if error is not None:
+                failures.append(error)
+
+        files_submitted = 0
+        # Create a pool of threads to download the files
+        with ThreadPoolExecutor(max_workers=root_cfg.CLOUD_DOWNLOAD_WORKERS) as executor:
+            for blob_name in blob_names:
+                if failures:
+                    break
+                if folder_prefix_len is not None:
+                    dst_dir = original_dst_dir.joinpath(blob_name[:folder_prefix_len])
+                dst_file = dst_dir.joinpath(blob_name)
+                if not overwrite and dst_file.exists():
+                    logger.debug(f"File {dst_file} already exists; skipping download")
+                    continue
+                make_dir(dst_dir)
+                in_flight.acquire()
+                future = executor.submit(self._download_file, download_container, blob_name, dst_file)
+                future.add_done_callback(download_done)
+                files_submitted += 1
+            logger.info(f"Downloading total of {files_submitted} files")
+
+        if failures:
+            raise failures[0]
+        logger.info(f"Completed downloaded of {files_submitted} files")
 
     def move_between_containers(
         self,
@@ -191,22 +274,48 @@ class CloudConnector:
         dst_container: destination container
         blob_names: list of blob names to move
         delete_src: delete the source blobs after successful upload; defaults to False
+
+        The server-side copies are started in parallel. If delete_src=True, each source blob is only
+        deleted once its copy has completed.
         """
         from_container = self._validate_container(src_container)
         to_container = self._validate_container(dst_container)
+        # start_copy_from_url() sends the tier as-is, so it must be the SDK's StandardBlobTier
+        # rather than our StorageTier wrapper; resolve it once for all the copies.
+        blob_tier = storage_tier.value
 
-        for blob_name in blob_names:
+        def copy_blob(blob_name: str) -> str:
             src_blob = from_container.get_blob_client(blob_name)
             dst_blob = to_container.get_blob_client(blob_name)
-            dst_blob.start_copy_from_url(src_blob.url, 
-                                         standard_blob_tier=storage_tier)
+            copy = dst_blob.start_copy_from_url(src_blob.url, 
+                                                standard_blob_tier=blob_tier)
             if delete_src:
-                src_blob.delete_blob()
+                self._wait_for_copy(dst_blob, str(copy["copy_status"]))
+            return blob_name
 
-            logger.debug(
-                f"Moved {blob_name} from {from_container.container_name} to {to_container.container_name}"
-                f" and {'deleted' if delete_src else 'did not delete'} the source"
-            )
+        if not blob_names:
+            return
+
+        copied: list[str] = []
+        copy_error: Optional[Exception] = None
+        with ThreadPoolExecutor(max_workers=min(32, len(blob_names))) as executor:
+            futures = [executor.submit(copy_blob, blob_name) for blob_name in blob_names]
+            for future in as_completed(futures):
+                try:
+                    copied.append(future.result())
+                except Exception as e:
+                    copy_error = copy_error or e
+
+        # Delete the sources of all successful copies in batches
+        if delete_src and copied:
+            self.delete_many(src_container, copied)
+
+        logger.debug(
+            f"Moved {len(copied)} blobs from {from_container.container_name} to "
+            f"{to_container.container_name} and {'deleted' if delete_src else 'did not delete'} the source"
+        )
+        if copy_error is not None:
+            raise copy_error
 
     def append_to_cloud(self, 
                         dst_container: str, 
@@ -231,50 +340,132 @@ class CloudConnector:
         If the remote file does exist, the first line (headers) in the src_file will be dropped
         so that we don't duplicate a header row.
         It the responsibility of the calling function to ensure that the columns & headers in the
-        CSV data are consistent between local and remote files"""
+        CSV data are consistent between local and remote files.
+        If the append fails part-way, src_file is rewritten to hold just the header and the rows that 
+        weren't appended, so that calling append_to_cloud() again resumes rather than repeating rows."""
 
+        unappended_file: Optional[Path] = None
         try:
             logger.debug(f"CloudConnector.append_to_cloud() with delete_src={delete_src} for {src_file}")
             target_container = self._validate_container(dst_container)
 
-            # Read the local file data ready to append
-            with src_file.open("r") as file:
-                local_lines = file.readlines()
-                if len(local_lines) == 1:
+            # We only read the header line here; the rest of the file is streamed to the blob in blocks
+            # so that we never hold more than MAX_APPEND_BLOCK_SIZE of it in memory.
+            with open(src_file, "rb") as src_data:
+                header = src_data.readline()
+                if not header.endswith(b"\n") or src_data.tell() == os.fstat(src_data.fileno()).st_size:
                     return False  # No data beyond headers
 
-            blob_client = target_container.get_blob_client(src_file.name)
-
-            if not blob_client.exists():
-                blob_client.create_append_blob()
-                # Include the Headers
-                data_to_append = "".join(local_lines[:])
-            else:
-                if safe_mode and not self._headers_match(blob_client, local_lines[0]):
-                    # We bin out rather than set inconsistent fields
-                    logger.error(
-                        f"{root_cfg.RAISE_WARN()}Failed due to inconsistent headers: local={local_lines[0]}"
-                    )
-                    return False
-                # Drop the Headers in the first line so we don't have repeat header rows
-                data_to_append = "".join(local_lines[1:])
+                blob_client = target_container.get_blob_client(src_file.name)
+                blob_key = f"{dst_container}/{src_file.name}"
 
-            # Append the data
-            blob_client.append_block(data_to_append)
+                if self._create_append_blob_if_missing(blob_client, blob_key):
+                    # Include the Headers
+                    src_data.seek(0)
+                else:
+                    local_header = header.decode("utf-8")
+                    if safe_mode and not self._headers_match(blob_client, local_header):
+                        # We bin out rather than set inconsistent fields
+                        logger.error(
+                            f"{root_cfg.RAISE_WARN()}Failed due to inconsistent headers: local={local_header}"
+                        )
+                        return False
+                    # The file is positioned after the header line, so we don't repeat header rows
+
+                # Append the data; if the blob needs re-creating, the whole file is re-read from the start
+                start = src_data.tell()
+                try:
+                    self._append_block(blob_client, blob_key, src_data)
+                except Exception:
+                    if src_data.tell() > start:
+                        unappended_file = self._save_unappended(src_file, header, src_data)
+                    raise
             if delete_src:
                 logger.debug(f"Deleting append file: {src_file}")
                 src_file.unlink()
 
             return True
         except Exception as e:
-            logger.error(f"{root_cfg.RAISE_WARN()}Failed to append data to {blob_client.blob_name}: {e!s}")
+            if unappended_file is not None:
+                # Some blocks were appended, so keep only the rows that weren't
+                os.replace(unappended_file, src_file)
+            logger.error(f"{root_cfg.RAISE_WARN()}Failed to append data to {src_file.name}: {e!s}")
             return False
 
+    @staticmethod
+    def _save_unappended(src_file: Path, header: bytes, src_data: BinaryIO) -> Path:
+        """Write the header and the rest of src_data, from its current position, to a file alongside
+        src_file and return its path."""
+        unappended_file = src_file.with_name(f"{src_file.name}.unappended")
+        with open(unappended_file, "wb") as dst:
+            dst.write(header)
+            shutil.copyfileobj(src_data, dst)
+        return unappended_file
+
+    def _create_append_blob_if_missing(self, blob_client: BlobClient, blob_key: str) -> bool:
+        """Create the append blob unless it already exists, returning True if it was created.
+
+        Blobs in the cache of known blobs cost no round trip. Otherwise the create is conditional 
+        (If-None-Match: *), so it takes one round trip whether or not the blob exists, rather than an
+        exists() HEAD followed by the create."""
+        if blob_key in self._append_exists:
+            return False
+        try:
+            blob_client.create_append_blob(match_condition=MatchConditions.IfMissing)
+        except (ResourceExistsError, ResourceModifiedError):
+            return False
+        return True
+
+    def _append_block(self, blob_client: BlobClient, blob_key: str, data: BinaryIO) -> None:
+        """Append data, from its current position to the end, to the blob and record that it exists.
+        
+        data starts with the header row; if the blob has been deleted since we cached its existence, 
+        re-create it and append data from the start. If the append fails, data is left positioned at 
+        the first byte that wasn't appended, so the caller can resume from there."""
+        try:
+            self._append_chunks(blob_client, data)
+        except ResourceNotFoundError:
+            logger.debug(f"Append blob {blob_key} not found; re-creating")
+            blob_client.create_append_blob()
+            data.seek(0)
+            self._append_chunks(blob_client, data)
+        with self._append_exists_lock:
+            self._append_exists.add(blob_key)
+
+    @staticmethod
+    def _append_chunks(blob_client: BlobClient, data: BinaryIO) -> None:
+        """Append data to the blob from its current position, in blocks of at most MAX_APPEND_BLOCK_SIZE.
+
+        Other devices may be appending to the same blob, and their blocks can land between ours, so each
+        block ends at a line break and never splits a row (unless a single row exceeds the block size).
+        If an append fails, data is positioned at the start of the block that failed."""
+        while True:
+            start = data.tell()
+            block = data.read(MAX_APPEND_BLOCK_SIZE)
+            if not block:
+                return
+            if len(block) == MAX_APPEND_BLOCK_SIZE:
+                end = block.rfind(b"\n") + 1
+                if 0 < end < len(block):
+                    block = block[:end]
+                    data.seek(start + end)
+            try:
+                blob_client.append_block(block)
+            except Exception:
+                data.seek(start)
+                raise
+
     def container_exists(self, container: str) -> bool:
         """Check if the specified container exists"""
         containerClient = self._validate_container(container)
         return containerClient.exists()
 
+    def list_containers(self) -> frozenset[str]:
+        """List the names of all containers in the storage account in a single paged request.
+        This requires account-level list permission; callers should fall back to container_exists()
+        if it raises."""
+        return frozenset(container.name for container in self._blob_service.list_containers())
+
     def exists(self, src_container: str, blob_name: str) -> bool:
         """Check if the specified blob exits"""
         containerClient = self._validate_container(src_container)
@@ -286,6 +477,17 @@ class CloudConnector:
         containerClient = self._validate_container(container)
         blob_client = containerClient.get_blob_client(blob_name)
         blob_client.delete_blob()
+        with self._append_exists_lock:
+            self._append_exists.discard(f"{container}/{blob_name}")
+
+    def delete_many(self, container: str, blob_names: list[str]) -> None:
+        """Delete the specified blobs.
+        Uses the Azure batch API, which accepts up to 256 deletes per request."""
+        containerClient = self._validate_container(container)
+        for i in range(0, len(blob_names), 256):
+            containerClient.delete_blobs(*blob_names[i:i + 256])
+        with self._append_exists_lock:
+            self._append_exists.difference_update(f"{container}/{name}" for name in blob_names)
 
     def list_cloud_files(
         self,
@@ -293,6 +495,7 @@ class CloudConnector:
         prefix: Optional[str] = None,
         suffix: Optional[str] = None,
         more_recent_than: Optional[datetime] = None,
+        max_results: Optional[int] = None,
     ) -> list[str]:
         """Similar to the Path.glob() method but against a cloud datastore.
 
@@ -302,27 +505,33 @@ class CloudConnector:
         - prefix: prefix to match to files in the datastore container; does not support wildcards
         - suffix: suffix to match to files in the datastore container
         - more_recent_than: Optional; if specified, only files more recent than this date will be returned
+        - max_results: Optional; if specified, stop once this many matching files have been found
 
         The current backend implementation is the Azure Blobstore which only supports prefix search 
         and tag search.
         """
         logger.debug(f"list_cloud_files() called with prefix={prefix}, suffix={suffix}, "
-                     f"more_recent_than={more_recent_than}")
+                     f"more_recent_than={more_recent_than}, max_results={max_results}")
         containerClient = self._validate_container(container)
 
-        files = []
-        if prefix is not None:
-            files = list(containerClient.list_blob_names(name_starts_with=prefix))
-        else:
-            files = list(containerClient.list_blob_names())
-
-        if suffix is not None:
-            files = [f for f in files if f.endswith(suffix)]
-
+        # Timestamps in filenames sort chronologically, so compare them as strings rather than
+        # parsing each one into a datetime.
+        cutoff = None
         if more_recent_than is not None:
-            files = [
-                f for f in files if file_naming.get_file_datetime(f) > more_recent_than
-            ]
+            cutoff = api.utc_to_fname_str(more_recent_than.astimezone(timezone.utc))
+        get_timestamp = file_naming.get_file_timestamp_str
+
+        # Filter lazily as each page of names arrives rather than materialising the full listing first.
+        # 5000 is the maximum page size supported by Azure.
+        blob_names = containerClient.list_blob_names(name_starts_with=prefix, 
+                                                     results_per_page=5000)
+        matches = (
+            f for f in blob_names
+            if (suffix is None or f.endswith(suffix)) and
+               (cutoff is None or (get_timestamp(f) or "") > cutoff)
+        )
+        # islice stops pulling pages from the service once we have max_results files
+        files = list(islice(matches, max_results))
         logger.debug(f"list_cloud_files returning {len(files)!s} files")
 
         return files
@@ -331,35 +540,156 @@ class CloudConnector:
         """Get the last modified time of the specified blob"""
         containerClient = self._validate_container(container)
         blob_client = containerClient.get_blob_client(blob_name)
-        if blob_client.exists():
+        # A single HEAD request; a missing blob raises rather than needing a separate exists() call
+        try:
             last_modified = blob_client.get_blob_properties().last_modified
-            # The Azure timezone is UTC but it's not explicitly set; set it
-            return last_modified.replace(tzinfo=timezone.utc)
-        else:
-            return datetime.min.replace(tzinfo=timezone.utc)
+        except ResourceNotFoundError:
+            return DATETIME_MIN_UTC
+        # The Azure timezone is UTC but it may not be explicitly set; set it
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        return last_modified
 
     ####################################################################################################
     # Private utility methods
     ####################################################################################################
-    def _download_file(self, src: BlobClient, dst_file: Path) -> str:
-        """Download a single file"""
+    def _upload_file(
+        self,
+        upload_container: ContainerClient,
+        file: Path,
+        delete_src: bool,
+        blob_tier: StandardBlobTier,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """Upload a single file as a block blob, deleting the local file on success if requested.
+        If timeout is set, it overrides the connection and read timeouts (in seconds) on each request."""
+        blob_client = upload_container.get_blob_client(file.name)
+        # Without a timeout, allow 600s to connect and the transport's default time between reads
+        connection_timeout, read_timeout = ((600.0, float(TRANSPORT_READ_TIMEOUT)) if timeout is None 
+                                            else (timeout, timeout))
+        # Opening the file doubles as the existence check, and fstat on the open handle gives its length
+        try:
+            data = open(file, "rb")
+        except FileNotFoundError:
+            logger.error(f"{root_cfg.RAISE_WARN()}Upload failed because file {file} does not exist")
+            return
+        # Pass the open file handle and its length so the SDK streams the file in chunks 
+        # (uploading them in parallel) rather than reading it all into memory.
+        with data:
+            blob_client.upload_blob(
+                data,
+                length=os.fstat(data.fileno()).st_size,
+                overwrite=True,
+                standard_blob_tier=blob_tier,
+                max_concurrency=root_cfg.CLOUD_MAX_CONCURRENCY,
+                connection_timeout=connection_timeout,
+                read_timeout=read_timeout,
+            )
+        if delete_src:
+            logger.debug(f"Deleting uploaded file: {file}")
+            file.unlink()
+
+    def _upload_files(
+        self,
+        upload_container: ContainerClient,
+        src_files: list[Path],
+        delete_src: bool,
+        blob_tier: StandardBlobTier,
+        timeout: Optional[float] = None,
+    ) -> dict[Path, Exception]:
+        """Upload the files in parallel, returning those that failed to upload with the error.
+        Every file is attempted, even if others fail."""
+        failures: dict[Path, Exception] = {}
+        if len(src_files) <= 1:
+            for file in src_files:
+                try:
+                    self._upload_file(upload_container, file, delete_src, blob_tier, timeout)
+                except Exception as e:
+                    failures[file] = e
+            return failures
+
+        # Overlap the per-file round trips
+        with ThreadPoolExecutor(max_workers=min(root_cfg.CLOUD_UPLOAD_WORKERS, len(src_files))) as executor:
+            futures = {
+                executor.submit(
+                    self._upload_file, upload_container, file, delete_src, blob_tier, timeout
+                ): file
+                for file in src_files
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    failures[futures[future]] = e
+        return failures
 
-        if not dst_file.parent.exists():
-            dst_file.parent.mkdir(parents=True, exist_ok=True)
+    def _download_file(self, src_container: ContainerClient, blob_name: str, dst_file: Path) -> str:
+        """Download a single file; the caller must have created dst_file's parent directory"""
         with open(dst_file, "wb") as my_file:
-            download_stream = src.download_blob()
-            my_file.write(download_stream.readall())
+            download_stream = src_container.download_blob(blob_name, 
+                                                          max_concurrency=root_cfg.CLOUD_MAX_CONCURRENCY)
+            # The first GET has told us the blob's size, so allocate the whole file up front rather 
+            # than growing it chunk by chunk
+            if download_stream.size > 0:
+                try:
+                    if hasattr(os, "posix_fallocate"):
+                        os.posix_fallocate(my_file.fileno(), 0, download_stream.size)
+                    else:
+                        my_file.truncate(download_stream.size)
+                except OSError as e:
+                    logger.debug(f"Failed to preallocate {dst_file}: {e!s}")
+            # Stream the chunks straight into the file rather than buffering the whole blob in memory
+            download_stream.readinto(my_file)
         return dst_file.name
 
 
+    def _wait_for_copy(self, dst_blob: BlobClient, copy_status: str, timeout: float = 600) -> None:
+        """Poll an asynchronous server-side copy with exponential backoff until it completes.
+        Raises an exception if the copy fails or does not complete within the timeout."""
+        delay = 0.1
+        waited = 0.0
+        while copy_status == "pending":
+            if waited > timeout:
+                raise TimeoutError(f"Copy to {dst_blob.blob_name} did not complete within {timeout}s")
+            sleep(delay)
+            waited += delay
+            delay = min(delay * 2, 5)
+            copy_status = str(dst_blob.get_blob_properties().copy.status)
+        if copy_status != "success":
+            raise ValueError(f"Copy to {dst_blob.blob_name} failed with status {copy_status}")
+
     def _validate_container(self, container: str) -> ContainerClient:
         if isinstance(container, str):
-            return ContainerClient.from_connection_string(
-                conn_str=self._get_connection_string(), container_name=container
-            )
+            return self._container_clients.get(container) or self._make_container(container)
         else:
             return container
 
+    def _make_container(self, container: str) -> ContainerClient:
+        """Create a ContainerClient and add it to the cache."""
+        with self._container_clients_lock:
+            if container not in self._container_clients:
+                self._container_clients[container] = self._blob_service.get_container_client(container)
+            return self._container_clients[container]
+
+    def _make_transport(self) -> RequestsTransport:
+        """Create the HTTP transport shared by all blob operations.
+        The default requests pool keeps only 10 connections per host, which is fewer than the number of 
+        parallel transfers we run, so connections would be dropped and re-established.
+
+        Supplying our own session means the SDK doesn't configure it, so we set up what it would have: 
+        the adapter that sends in 32KiB socket blocks, and the storage SDK's timeouts and read block size."""
+        session = requests.Session()
+        # Retries are handled by the Azure SDK's retry policy, so disable them at the HTTP layer
+        adapter = BiggerBlockSizeHTTPAdapter(pool_maxsize=root_cfg.CLOUD_CONNECTION_POOL_SIZE,
+                                             max_retries=Retry(total=False, redirect=False, 
+                                                               raise_on_status=False))
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return RequestsTransport(session=session,
+                                 connection_timeout=TRANSPORT_CONNECTION_TIMEOUT,
+                                 read_timeout=TRANSPORT_READ_TIMEOUT,
+                                 connection_data_block_size=TRANSPORT_DATA_BLOCK_SIZE)
+
     def _get_connection_string(self) -> str:
         return self._connection_string
 
@@ -373,21 +703,31 @@ class CloudConnector:
 
     def _headers_match(self, blob_client: BlobClient, local_line: str) -> bool:
         # Check the local and remote headers match
-        start_of_contents = blob_client.download_blob(encoding="utf-8").read(chars=1000) 
-        if start_of_contents is not None and start_of_contents != "":
+        # We only need the first line, so make a ranged GET for the start of the blob and only decode 
+        # up to the first newline.
+        try:
+            start_of_contents = blob_client.download_blob(offset=0, length=1024).readall()
+        except HttpResponseError as e:
+            if e.status_code == 416:
+                # The range is not satisfiable because the blob is empty; there are no headers to check
+                return True
+            raise
+        if start_of_contents:
             # Get the first line from start_of_contents
-            cloud_lines = start_of_contents.splitlines()
-            if len(cloud_lines) >= 1:
-                # We have headers from local and cloud files; check headers match
-                local_headers = local_line.strip().split(",")
-                cloud_headers = cloud_lines[0].strip().split(",")
-                if len(local_headers) != len(cloud_headers) or not all(
-                    lh == ch for lh, ch in zip(local_headers, cloud_headers)
-                ):
-                    # They don't match
-                    logger.warning(f"Local and remote headers do not match in {blob_client.blob_name}: "
-                                   f"{local_headers}, {cloud_headers}")
-                    return False
+            header_end = start_of_contents.find(b"\n")
+            cloud_line = start_of_contents[:header_end if header_end >= 0 else None].decode(
+                "utf-8", errors="replace"
+            )
+            # We have headers from local and cloud files; check headers match
+            local_headers = local_line.strip().split(",")
+            cloud_headers = cloud_line.strip().split(",")
+            if len(local_headers) != len(cloud_headers) or not all(
+                lh == ch for lh, ch in zip(local_headers, cloud_headers)
+            ):
+                # They don't match
+                logger.warning(f"Local and remote headers do not match in {blob_client.blob_name}: "
+                               f"{local_headers}, {cloud_headers}")
+                return False
         # We can't find any issues
         return True
 
@@ -443,14 +783,33 @@ class LocalCloudConnector(CloudConnector):
         been deleted (if delete_src=True), while any remaining files in src_files will not have been
         deleted.
         """
+        dst_dir = self.local_cloud / dst_container
+        dst_dir.mkdir(parents=True, exist_ok=True)
         for file in src_files:
-                if file.exists():
-                    # Copy the file to the local cloud directory
-                    dst_file = self.local_cloud / dst_container / file.name
-                    dst_file.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy(file, dst_file)
-                    if delete_src:
-                        file.unlink()
+            if file.exists():
+                # Move or copy the file to the local cloud directory
+                if delete_src:
+                    self._move_file(file, dst_dir / file.name)
+                else:
+                    self._copy_file(file, dst_dir / file.name)
+
+    def make_uploader(
+        self,
+        dst_container: str,
+        storage_tier: api.StorageTier = api.StorageTier.HOT,
+    ) -> Callable[[Path, bool], None]:
+        """Return a function that uploads a single file to dst_container; see CloudConnector.make_uploader"""
+        dst_dir = self.local_cloud / dst_container
+        dst_dir.mkdir(parents=True, exist_ok=True)
+
+        def upload(src_file: Path, delete_src: bool) -> None:
+            if src_file.exists():
+                if delete_src:
+                    self._move_file(src_file, dst_dir / src_file.name)
+                else:
+                    self._copy_file(src_file, dst_dir / src_file.name)
+
+        return upload
 
     def download_from_container(
         self, src_container: str, src_file: str, dst_file: Path
@@ -460,13 +819,10 @@ class LocalCloudConnector(CloudConnector):
         if dst_file is None or not isinstance(dst_file, Path):
             return
 
-        if not dst_file.parent.exists():
-            dst_file.parent.mkdir(parents=True, exist_ok=True)
-
-        if dst_file.exists():
-            dst_file.unlink()
-
-        shutil.copy(self.local_cloud / src_container / src_file, dst_file)
+        # mkdir(exist_ok=True) is idempotent, and copyfile() overwrites dst_file, so neither needs an
+        # exists() check first
+        dst_file.parent.mkdir(parents=True, exist_ok=True)
+        self._copy_file(self.local_cloud / src_container / src_file, dst_file)
 
     def download_container(
         self,
@@ -489,13 +845,19 @@ class LocalCloudConnector(CloudConnector):
 
         download_container = self.local_cloud / src_container
 
+        prefix_folder_dir = dst_dir
+        made_dirs: set[Path] = set()
         if files is None:
-            for blob in download_container.glob("*"):
-                if folder_prefix_len is not None:
-                    prefix_folder_dir = dst_dir.joinpath(blob.name[:folder_prefix_len])
-                    if not prefix_folder_dir.exists():
-                        prefix_folder_dir.mkdir(parents=True, exist_ok=True)
-                shutil.copy(blob, prefix_folder_dir)
+            with os.scandir(download_container) as entries:
+                for blob in entries:
+                    if not blob.is_file():
+                        continue
+                    if folder_prefix_len is not None:
+                        prefix_folder_dir = dst_dir.joinpath(blob.name[:folder_prefix_len])
+                        if prefix_folder_dir not in made_dirs:
+                            prefix_folder_dir.mkdir(parents=True, exist_ok=True)
+                            made_dirs.add(prefix_folder_dir)
+                    self._copy_file(blob.path, prefix_folder_dir / blob.name)
         else:
             for blob_name in files:
                 src_file = download_container / blob_name
@@ -505,7 +867,10 @@ class LocalCloudConnector(CloudConnector):
                 if not overwrite and dst_file.exists():
                     logger.debug(f"File {dst_file} already exists; skipping download")
                     continue
-                shutil.copy(src_file, dst_file)
+                if prefix_folder_dir not in made_dirs:
+                    prefix_folder_dir.mkdir(parents=True, exist_ok=True)
+                    made_dirs.add(prefix_folder_dir)
+                self._copy_file(src_file, dst_file)
 
     def move_between_containers(
         self,
@@ -525,12 +890,12 @@ class LocalCloudConnector(CloudConnector):
         delete_src: delete the source blobs after successful upload; defaults to False
         """
         for blob_name in blob_names:
-            shutil.copy(
-                self.local_cloud / src_container / blob_name,
-                self.local_cloud / dst_container / blob_name
-            )
+            src_blob = self.local_cloud / src_container / blob_name
+            dst_blob = self.local_cloud / dst_container / blob_name
             if delete_src:
-                (self.local_cloud / src_container / blob_name).unlink()
+                self._move_file(src_blob, dst_blob)
+            else:
+                self._copy_file(src_blob, dst_blob)
 
             logger.debug(
                 f"Moved {blob_name} from {src_container} to {dst_container}"
@@ -605,6 +970,13 @@ class LocalCloudConnector(CloudConnector):
             containerClient.mkdir(parents=True, exist_ok=True)
         return True
 
+    def list_containers(self) -> frozenset[str]:
+        """List the names of all containers in the local cloud"""
+        if not self.local_cloud.exists():
+            return frozenset()
+        with os.scandir(self.local_cloud) as it:
+            return frozenset(entry.name for entry in it if entry.is_dir())
+
     def exists(self, src_container: str, blob_name: str) -> bool:
         """Check if the specified blob exits"""
         blob_client = self.local_cloud / src_container / blob_name
@@ -615,12 +987,18 @@ class LocalCloudConnector(CloudConnector):
         blob_client = self.local_cloud / container / blob_name
         blob_client.unlink()
 
+    def delete_many(self, container: str, blob_names: list[str]) -> None:
+        """Delete the specified blobs"""
+        for blob_name in blob_names:
+            self.delete(container, blob_name)
+
     def list_cloud_files(
         self,
         container: str,
         prefix: Optional[str] = None,
         suffix: Optional[str] = None,
         more_recent_than: Optional[datetime] = None,
+        max_results: Optional[int] = None,
     ) -> list[str]:
         """Similar to the Path.glob() method but against a cloud datastore.
 
@@ -630,27 +1008,32 @@ class LocalCloudConnector(CloudConnector):
         - prefix: prefix to match to files in the datastore container; does not support wildcards
         - suffix: suffix to match to files in the datastore container
         - more_recent_than: Optional; if specified, only files more recent than this date will be returned
+        - max_results: Optional; if specified, stop once this many matching files have been found
 
         The current backend implementation is the Azure Blobstore which only supports prefix search 
         and tag search.
         """
         containerClient = self.local_cloud / container
+        if not containerClient.exists():
+            return []
 
-        files = file_paths = []
-        if prefix is not None:
-            query = f"{prefix}*"
-        else:
-            query = "*"
-        file_paths = list(containerClient.glob(query))
-        files = [f.name for f in file_paths]
-
-        if suffix is not None:
-            files = [f for f in files if f.endswith(suffix)]
-
+        # As for Azure, the timestamp in the filename (not the file's mtime) decides more_recent_than
+        cutoff = None
         if more_recent_than is not None:
+            cutoff = api.utc_to_fname_str(more_recent_than.astimezone(timezone.utc))
+        get_timestamp = file_naming.get_file_timestamp_str
+
+        # os.scandir() avoids building a Path object per blob; all the filters are applied in one pass
+        with os.scandir(containerClient) as entries:
             files = [
-                f for f in files if file_naming.get_file_datetime(f) > more_recent_than
+                e.name for e in entries
+                if (prefix is None or e.name.startswith(prefix)) and 
+                (suffix is None or e.name.endswith(suffix)) and
+                (cutoff is None or (get_timestamp(e.name) or "") > cutoff)
             ]
+
+        if max_results is not None:
+            files = files[:max_results]
         logger.debug(f"list_cloud_files returning {len(files)!s} files")
 
         return files
@@ -659,20 +1042,103 @@ class LocalCloudConnector(CloudConnector):
         """Get the last modified time of the specified blob"""
         containerClient = self.local_cloud / container
         blob_client = containerClient / blob_name
-        if blob_client.exists():
+        try:
             last_modified = blob_client.stat().st_mtime
-            # The Azure timezone is UTC but it's not explicitly set; set it
-            return datetime.fromtimestamp(last_modified, tz=timezone.utc)
-        else:
-            return datetime.min.replace(tzinfo=timezone.utc)
+        except FileNotFoundError:
+            return DATETIME_MIN_UTC
+        return datetime.fromtimestamp(last_modified, tz=timezone.utc)
+
+    @classmethod
+    def _move_file(cls, src: Path, dst: Path) -> None:
+        """Move src to dst. A rename is a single metadata operation rather than a copy of the data; 
+        if src and dst are on different filesystems we fall back to a copy and delete."""
+        try:
+            src.replace(dst)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            cls._copy_file(src, dst)
+            src.unlink()
+
+    @staticmethod
+    def _copy_file(src: Path | str, dst: Path) -> None:
+        """Copy the contents of src to dst.
+        On Linux, copy_file_range() lets copy-on-write filesystems (btrfs, xfs) share the file's extents 
+        rather than copying the data. Elsewhere, or if it fails, we fall back to shutil.copyfile()."""
+        if hasattr(os, "copy_file_range"):
+            try:
+                with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                    remaining = os.fstat(fsrc.fileno()).st_size
+                    while remaining > 0:
+                        copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                        if copied == 0:
+                            break
+                        remaining -= copied
+                return
+            except OSError:
+                pass
+        shutil.copyfile(src, dst)
 
 #####################################################################################################
 # AsyncCloudConnector class
 # This class uses async methods to *UPLOAD* files to the cloud storage provider (Azure Blob Storage).
 # This improves resilience to transient network issues and reduces data loss.
 # Download / exists / list methods are *not* asynchronous and use the default CloudConnector.
+# Callers must call shutdown() when finished with the connector, to flush any pending uploads.
 #####################################################################################################
-@dataclass
+# Appends to the same blob that arrive within this window (in seconds) are merged into a single 
+# append_block call.
+APPEND_COALESCE_DELAY: float = 0.25
+# Uploads to the same container and tier that arrive within this window (in seconds) are batched into a 
+# single queue item, up to MAX_UPLOAD_BATCH_FILES files or MAX_UPLOAD_BATCH_BYTES.
+UPLOAD_COALESCE_DELAY: float = 0.05
+MAX_UPLOAD_BATCH_FILES: int = 32
+MAX_UPLOAD_BATCH_BYTES: int = 4 * 1024 * 1024
+# Maximum number of upload / append actions that may be queued or running at once. When the cloud is 
+# unreachable, new actions wait up to ASYNC_ENQUEUE_TIMEOUT seconds for space and are then dropped, so
+# that a long outage can't grow memory without bound. Retries of existing actions are always accepted.
+ASYNC_QUEUE_CAP: int = 1024
+ASYNC_ENQUEUE_TIMEOUT: float = 10.0
+# On shutdown, queued and running actions are given this long (in seconds) to complete before the 
+# remainder are cancelled.
+ASYNC_SHUTDOWN_GRACE: float = 10.0
+# Maximum number of queued items the dispatcher drains in one go when looking for appends to merge.
+MAX_DISPATCH_BATCH: int = 100
+# Uploads are network-bound, so we run more worker threads than cores.
+ASYNC_WORKER_POOL_SIZE: int = min((os.cpu_count() or 1) * 2, 16)
+# Appends run on their own pool so that a burst of large uploads can't hold up the (small, frequent)
+# journal appends.
+ASYNC_APPEND_POOL_SIZE: int = 4
+# Failed uploads / appends are retried with exponential backoff and full jitter, starting from 
+# ASYNC_BASE_BACKOFF and capped at ASYNC_MAX_BACKOFF seconds; at ~30s a retry, ASYNC_MAX_RETRIES 
+# rides out outages of around an hour before we give up.
+ASYNC_BASE_BACKOFF: float = 1.0
+ASYNC_MAX_BACKOFF: float = 60.0
+ASYNC_MAX_RETRIES: int = 100
+# Circuit breaker: after BREAKER_FAILURE_THRESHOLD consecutive failures we stop calling the cloud for 
+# BREAKER_COOLDOWN seconds, then let a single action through to probe whether it has recovered.
+BREAKER_FAILURE_THRESHOLD: int = 5
+BREAKER_COOLDOWN: float = 30.0
+# Uploads to each container are paced by a token bucket (one token per file). The rate is halved each 
+# time the cloud throttles us (HTTP 429 / 503) and recovers by THROTTLE_RATE_STEP files/s for each 
+# successful upload, up to THROTTLE_MAX_RATE; this stops retries of throttled uploads feeding the overload.
+THROTTLE_MAX_RATE: float = 50.0
+THROTTLE_MIN_RATE: float = 0.5
+THROTTLE_RATE_STEP: float = 1.0
+THROTTLE_STATUS_CODES: tuple[int, ...] = (429, 503)
+# Number of recent upload durations kept per container, for get_stats() and the upload timeout.
+# Only files small enough to upload in a single request (CLOUD_MAX_SINGLE_PUT_SIZE) are timed.
+UPLOAD_STATS_WINDOW: int = 200
+# Once UPLOAD_TIMEOUT_MIN_SAMPLES such files have been uploaded to a container, its single-request 
+# uploads time out after twice the p95 upload time, bounded to [UPLOAD_TIMEOUT_MIN, UPLOAD_TIMEOUT_MAX]
+# seconds, so that a stuck connection fails fast and is retried rather than pinning a worker. 
+# Larger files keep the default timeouts.
+UPLOAD_TIMEOUT_MIN_SAMPLES: int = 20
+UPLOAD_TIMEOUT_MIN: float = 5.0
+UPLOAD_TIMEOUT_MAX: float = 30.0
+
+# Actions are mutated as they are retried (iteration, src_files, data), so they can't be frozen.
+@dataclass(slots=True)
 class AsyncUpload():
     """Class to hold the action to be performed on the cloud"""
     dst_container: str
@@ -681,15 +1147,51 @@ class AsyncUpload():
     storage_tier: api.StorageTier = api.StorageTier.HOT
     iteration: int = 0
 
-@dataclass
+@dataclass(slots=True)
 class AsyncAppend():
     """Class to hold the action to be performed on the cloud"""
     dst_container: str
     src_fname: str
     delete_src: bool
+    # The header line, followed by one or more blocks of CSV rows
     data: list[str]
     safe_mode: bool = False
     iteration: int = 0
+    # If a previous attempt appended some of the data before failing, the position in the encoded data
+    # from which to resume
+    resume_pos: Optional[int] = None
+
+class TokenBucket():
+    """Token bucket whose rate (tokens/s) adapts by additive-increase / multiplicative-decrease."""
+    def __init__(self, rate: float = THROTTLE_MAX_RATE, capacity: float = THROTTLE_MAX_RATE) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float, stop_event: threading.Event) -> None:
+        """Block until the tokens are available, or stop_event is set."""
+        tokens = min(tokens, self.capacity)
+        while True:
+            with self._lock:
+                now = monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait_time = (tokens - self._tokens) / self.rate
+            if stop_event.wait(wait_time):
+                return
+
+    def increase(self) -> None:
+        with self._lock:
+            self.rate = min(THROTTLE_MAX_RATE, self.rate + THROTTLE_RATE_STEP)
+
+    def decrease(self) -> None:
+        with self._lock:
+            self.rate = max(THROTTLE_MIN_RATE, self.rate / 2)
 
 class AsyncCloudConnector(CloudConnector):
 
@@ -697,37 +1199,104 @@ class AsyncCloudConnector(CloudConnector):
         logger.debug("Creating AsyncCloudConnector instance")
         CloudConnector.__init__(self)
         self._stop_requested = False
-        self.futures: list[Future] = []
-        self._upload_queue: Queue = Queue()
-        self._worker_pool: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=6)
-        # Start the worker thread to process the upload queue
-        self._worker_pool.submit(self.do_work)
-        #self._worker_pool.submit(self.monitor_futures)
-
-    def __del__(self) -> None:
-        self._stop_requested = True
-        # Flush the queue by putting an empty object on it
-        self._upload_queue.put(None)
-        self._worker_pool.shutdown(cancel_futures=True)
+        # Set on shutdown to cut short any retry backoff in progress
+        self._stop_event = threading.Event()
+        # Circuit breaker state, shared by all the worker threads. 
+        # The breaker is closed while _breaker_opened_at is None.
+        self._breaker_lock = threading.Lock()
+        self._breaker_failures = 0
+        self._breaker_opened_at: Optional[float] = None
+        self._breaker_probing = False
+        # Upload rate limiter for each container
+        self._buckets: dict[str, TokenBucket] = {}
+        self._buckets_lock = threading.Lock()
+        # Recent upload durations (seconds per file) for each container, and the number of retries.
+        # The lock stops get_stats() iterating over a deque while a worker appends to it.
+        self._upload_durations: dict[str, deque[float]] = {}
+        self._upload_durations_lock = threading.Lock()
+        self._retry_count = 0
+        # In-flight upload / append tasks; each removes itself on completion via _future_done()
+        self.futures: set[Future] = set()
+        # Only do_work() consumes the queue, so the lighter SimpleQueue suffices; completion is tracked
+        # by _queued_actions rather than Queue.task_done() / join().
+        self._upload_queue: SimpleQueue = SimpleQueue()
+        # Number of actions on _upload_queue or running in the pools; bounded by ASYNC_QUEUE_CAP
+        self._queued_actions = 0
+        self._queued_actions_cond = threading.Condition()
+        self._worker_pool: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=ASYNC_WORKER_POOL_SIZE,
+                                                                   thread_name_prefix="cc-upload")
+        self._append_pool: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=ASYNC_APPEND_POOL_SIZE,
+                                                                   thread_name_prefix="cc-append")
+        # SHA256 of the header line last appended to each (container, blob); lets safe_mode appends
+        # skip the _headers_match() network call when the local header is unchanged.
+        self._header_hashes: dict[tuple[str, str], bytes] = {}
+        # Appends waiting to be merged and queued, keyed by (container, blob), with their size in chars
+        self._append_coalesce: dict[tuple[str, str], list[AsyncAppend]] = {}
+        self._append_coalesce_size: dict[tuple[str, str], int] = {}
+        self._append_coalesce_lock = threading.Lock()
+        self._append_coalesce_timer: Optional[threading.Timer] = None
+        # Uploads waiting to be batched and queued, keyed by (container, delete_src, tier), with their
+        # size in bytes
+        self._upload_coalesce: dict[tuple[str, bool, api.StorageTier], list[Path]] = {}
+        self._upload_coalesce_size: dict[tuple[str, bool, api.StorageTier], int] = {}
+        self._upload_coalesce_lock = threading.Lock()
+        self._upload_coalesce_timer: Optional[threading.Timer] = None
+        # Start the dispatcher thread to process the upload queue.
+        # This runs outside the worker pool so that all pool threads are available for uploads.
+        self._dispatcher = threading.Thread(target=self.do_work, name="cc-dispatcher", daemon=True)
+        self._dispatcher.start()
+
+    def get_stats(self) -> dict[str, float]:
+        """Return statistics on the async upload queue, to help tune the pool size and timeouts.
+        
+        - queue_depth: number of actions queued or running
+        - upload_latency_p95: 95th percentile time (s) to upload a file, over recent single-request uploads
+        - retry_count: number of uploads / appends retried since start-up"""
+        with self._upload_durations_lock:
+            durations = [d for container_durations in self._upload_durations.values() 
+                         for d in container_durations]
+        return {
+            "queue_depth": self._queued_actions,
+            "upload_latency_p95": round(self._p95(durations), 3),
+            "retry_count": self._retry_count,
+        }
 
     def block_until_queue_empty(self):
         """ Method to support unit tests - blocks until queue has been processed """
-        # Only return when there are no items in the queue
-        while not self._upload_queue.empty():
-            sleep(0.5)
-        logger.info("Upload queue is empty")
-        # Now block until the worker pool has completed the current work
-        # We don't want to shut it down, we just want to know when it's done
-        while len(self.futures) > 0:
-            sleep(0.5)
+        # Don't wait on the coalescing timers for any pending uploads or appends
+        self._flush_uploads()
+        self._flush_appends()
+        # Failed tasks re-queue themselves before they complete, so the count only reaches zero once
+        # every action has finished for good.
+        with self._queued_actions_cond:
+            self._queued_actions_cond.wait_for(lambda: self._queued_actions == 0)
         logger.info("All ThreadPool tasks completed")
 
     def shutdown(self):
-        """ Method to support unit tests - shutdown the worker pool """
+        """Flush any uploads / appends still being coalesced, give queued work ASYNC_SHUTDOWN_GRACE to 
+        complete, and then stop the dispatcher and worker pools.
+
+        This must be called before the connector is discarded or the process exits. The dispatcher 
+        thread holds a reference to the connector, so it is never garbage collected while running and 
+        there is no __del__ to fall back on. Async append_to_cloud() deletes its source file before the 
+        data is sent, so data still waiting to be coalesced would otherwise be lost."""
+        self._flush_uploads()
+        self._flush_appends()
+        # Let queued data drain for a short while rather than silently dropping it
+        deadline = monotonic() + ASYNC_SHUTDOWN_GRACE
+        with self._queued_actions_cond:
+            while self._queued_actions > 0 and monotonic() < deadline:
+                self._queued_actions_cond.wait(timeout=deadline - monotonic())
+            if self._queued_actions > 0:
+                logger.warning(f"Shutting down with {self._queued_actions} uploads / appends incomplete")
         self._stop_requested = True
+        self._stop_event.set()
         # Flush the queue by putting an empty object on it
         self._upload_queue.put(None)
+        # Let the dispatcher finish its current batch so that it doesn't submit to a shutdown pool
+        self._dispatcher.join(timeout=10)
         self._worker_pool.shutdown(cancel_futures=True)
+        self._append_pool.shutdown(cancel_futures=True)
 
     #################################################################################################
     # Public methods
@@ -745,23 +1314,45 @@ class AsyncCloudConnector(CloudConnector):
         if not isinstance(src_files, list):
             src_files = [src_files]
 
+        # Stat each file once, for both its existence and the size of the batch.
+        # Build a new list rather than removing from src_files while iterating over it
+        existing_files: list[Path] = []
+        batch_bytes = 0
         for file in src_files:
-            if not file.exists():
+            try:
+                batch_bytes += file.stat().st_size
+                existing_files.append(file)
+            except FileNotFoundError:
                 logger.error(f"{root_cfg.RAISE_WARN()}Upload of file {file} aborted; does not exist")
-                src_files.remove(file)
+        src_files = existing_files
 
         if delete_src:
             # Rename the files so that they are effectively deleted from the callers perspective
             # We delete this temporary directory in _async_upload() after the upload is complete
             tmp_dir = file_naming.get_temporary_dir()
             for i, file in enumerate(src_files):
-                # Move the files to the tmp_dir
+                # Move the files to the tmp_dir. This is a rename (a single metadata update) unless
+                # TMP_DIR is on a different filesystem, in which case shutil.move falls back to a copy.
                 tmp_file = tmp_dir / file.name
-                file.rename(tmp_file)
+                shutil.move(file, tmp_file)
                 src_files[i] = tmp_file
 
         if src_files:
-            self._upload_queue.put(AsyncUpload(dst_container, src_files, delete_src, storage_tier))
+            self._coalesce_upload(dst_container, src_files, delete_src, storage_tier, batch_bytes)
+
+    def make_uploader(
+        self,
+        dst_container: str,
+        storage_tier: api.StorageTier = api.StorageTier.HOT,
+    ) -> Callable[[Path, bool], None]:
+        """Async version of make_uploader; uploads are queued as for upload_to_container()."""
+        # Warm the ContainerClient cache so that the queued uploads don't have to create it
+        self._validate_container(dst_container)
+
+        def upload(src_file: Path, delete_src: bool) -> None:
+            self.upload_to_container(dst_container, [src_file], delete_src, storage_tier)
+
+        return upload
 
     def append_to_cloud(self, 
                         dst_container: str, 
@@ -776,26 +1367,28 @@ class AsyncCloudConnector(CloudConnector):
         if isinstance(src_file, str):
             src_file = Path(src_file)
         
-        if not src_file.exists():
+        # Read the local file data ready to append; opening the file doubles as the existence check.
+        # We only need to split off the header line, so the rows are read as a single string rather
+        # than split into lines that are only joined back together when appended.
+        try:
+            with src_file.open("r") as file:
+                header = file.readline()
+                rows = file.read()
+        except FileNotFoundError:
             logger.error(f"{root_cfg.RAISE_WARN()}Upload failed because file {src_file} does not exist")
             return False
-        
-        # Read the local file data ready to append
-        data: list[str] = []
-        with src_file.open("r") as file:
-            data = file.readlines()
-            if len(data) == 1:
-                return False  # No data beyond headers
+        if not rows:
+            return False  # No data beyond headers
             
         if delete_src:
             # Although this is asynchronous, we need to appear to delete the src_files synchronously
             src_file.unlink()
 
-        self._upload_queue.put(AsyncAppend(dst_container, 
-                                           src_file.name, 
-                                           delete_src, 
-                                           safe_mode=safe_mode,
-                                           data = data))
+        self._coalesce_append(AsyncAppend(dst_container, 
+                                          src_file.name, 
+                                          delete_src, 
+                                          safe_mode=safe_mode,
+                                          data = [header, rows]))
 
         return True
 
@@ -803,6 +1396,173 @@ class AsyncCloudConnector(CloudConnector):
     ##################################################################################################
     # Private methods
     ##################################################################################################
+    def _coalesce_upload(self,
+                         dst_container: str,
+                         src_files: list[Path],
+                         delete_src: bool,
+                         storage_tier: api.StorageTier,
+                         batch_bytes: int) -> None:
+        """Hold the files for UPLOAD_COALESCE_DELAY so that further uploads to the same container can be
+        batched with them into a single AsyncUpload.
+        
+        The files from one call are never split across batches: with delete_src, they share a temporary
+        directory that _async_upload() deletes once its batch is complete."""
+        key = (dst_container, delete_src, storage_tier)
+        flush_now = False
+        with self._upload_coalesce_lock:
+            self._upload_coalesce.setdefault(key, []).extend(src_files)
+            size = self._upload_coalesce_size.get(key, 0) + batch_bytes
+            self._upload_coalesce_size[key] = size
+            if len(self._upload_coalesce[key]) >= MAX_UPLOAD_BATCH_FILES or size >= MAX_UPLOAD_BATCH_BYTES:
+                flush_now = True
+            elif self._upload_coalesce_timer is None:
+                self._upload_coalesce_timer = threading.Timer(UPLOAD_COALESCE_DELAY, self._flush_uploads)
+                self._upload_coalesce_timer.daemon = True
+                self._upload_coalesce_timer.start()
+
+        if flush_now:
+            self._flush_uploads(key)
+
+    def _flush_uploads(self, key: Optional[tuple[str, bool, api.StorageTier]] = None) -> None:
+        """Put the pending uploads on the upload queue.
+        If key is None, all pending uploads are flushed."""
+        with self._upload_coalesce_lock:
+            if key is None:
+                pending = list(self._upload_coalesce.items())
+                self._upload_coalesce.clear()
+                self._upload_coalesce_size.clear()
+                if self._upload_coalesce_timer is not None:
+                    self._upload_coalesce_timer.cancel()
+                    self._upload_coalesce_timer = None
+            else:
+                pending = [(key, self._upload_coalesce.pop(key, []))]
+                self._upload_coalesce_size.pop(key, None)
+
+        for (dst_container, delete_src, storage_tier), src_files in pending:
+            if src_files:
+                self._enqueue(AsyncUpload(dst_container, src_files, delete_src, storage_tier))
+
+    def _coalesce_append(self, action: AsyncAppend) -> None:
+        """Hold the append for APPEND_COALESCE_DELAY so that further appends to the same blob
+        can be merged into it; flush early if the merged data approaches MAX_APPEND_BLOCK_SIZE."""
+        key = (action.dst_container, action.src_fname)
+        flush_now = False
+        with self._append_coalesce_lock:
+            self._append_coalesce.setdefault(key, []).append(action)
+            size = self._append_coalesce_size.get(key, 0) + sum(len(line) for line in action.data)
+            self._append_coalesce_size[key] = size
+            if size >= MAX_APPEND_BLOCK_SIZE:
+                flush_now = True
+            elif self._append_coalesce_timer is None:
+                self._append_coalesce_timer = threading.Timer(APPEND_COALESCE_DELAY, self._flush_appends)
+                self._append_coalesce_timer.daemon = True
+                self._append_coalesce_timer.start()
+
+        if flush_now:
+            self._flush_appends(key)
+
+    def _flush_appends(self, key: Optional[tuple[str, str]] = None) -> None:
+        """Merge the pending appends and put them on the upload queue.
+        If key is None, all pending appends are flushed."""
+        with self._append_coalesce_lock:
+            if key is None:
+                pending = list(self._append_coalesce.values())
+                self._append_coalesce.clear()
+                self._append_coalesce_size.clear()
+                if self._append_coalesce_timer is not None:
+                    self._append_coalesce_timer.cancel()
+                    self._append_coalesce_timer = None
+            else:
+                pending = [self._append_coalesce.pop(key, [])]
+                self._append_coalesce_size.pop(key, None)
+
+        for actions in pending:
+            for action in self._merge_appends(actions):
+                self._enqueue(action)
+
+    def _enqueue(self, action: AsyncUpload | AsyncAppend) -> None:
+        """Put a new action on the upload queue, waiting up to ASYNC_ENQUEUE_TIMEOUT for space.
+        If the queue is still full the action is dropped."""
+        with self._queued_actions_cond:
+            if not self._queued_actions_cond.wait_for(lambda: self._queued_actions < ASYNC_QUEUE_CAP,
+                                                      timeout=ASYNC_ENQUEUE_TIMEOUT):
+                if isinstance(action, AsyncUpload):
+                    # Leave the files where they are (in our temporary directory if delete_src) rather 
+                    # than deleting data we failed to upload
+                    logger.error(f"{root_cfg.RAISE_WARN()}Upload queue full; dropped upload of "
+                                 f"{action.src_files} to {action.dst_container}")
+                else:
+                    logger.error(f"{root_cfg.RAISE_WARN()}Upload queue full; dropped append of "
+                                 f"{sum(len(rows) for rows in action.data[1:])} chars to {action.src_fname}")
+                return
+            self._queued_actions += 1
+        self._upload_queue.put(action)
+
+    def _requeue_action(self, action: AsyncUpload | AsyncAppend) -> None:
+        """Put an existing action back on the upload queue. This never blocks, so it is safe to call 
+        from the worker threads; the action already holds a place in ASYNC_QUEUE_CAP."""
+        with self._queued_actions_cond:
+            self._queued_actions += 1
+        self._upload_queue.put(action)
+
+    def _release_actions(self, count: int) -> None:
+        """Record that count actions have left the queue / pools for good."""
+        if count > 0:
+            with self._queued_actions_cond:
+                self._queued_actions -= count
+                self._queued_actions_cond.notify_all()
+
+    @staticmethod
+    def _merge_appends(actions: list[AsyncAppend]) -> list[AsyncAppend]:
+        """Merge consecutive appends to the same blob that share a header line, up to 
+        MAX_APPEND_BLOCK_SIZE per merged append.
+        The header line is dropped from all but the first append in each merged group. An append that 
+        is part-way through (resume_pos is set) can only start a group, as its position refers to its 
+        own data.
+        A merged append keeps the lowest retry count of its parts, so fresh data merged into a retry
+        that is close to ASYNC_MAX_RETRIES isn't given up on with it."""
+        merged: list[AsyncAppend] = []
+        merged_size = 0
+        for action in actions:
+            size = sum(len(line) for line in action.data[1:])
+            if (merged and 
+                merged[-1].data[0] == action.data[0] and 
+                action.resume_pos is None and
+                merged_size + size <= MAX_APPEND_BLOCK_SIZE):
+                merged[-1].data.extend(action.data[1:])
+                merged[-1].safe_mode = merged[-1].safe_mode or action.safe_mode
+                merged[-1].iteration = min(merged[-1].iteration, action.iteration)
+                merged_size += size
+            else:
+                merged.append(action)
+                merged_size = len(action.data[0]) + size
+        return merged
+
+    @classmethod
+    def _merge_queued_appends(cls, items: list) -> list:
+        """Merge the AsyncAppends in a batch of queue items by target blob.
+        Each merged append is dispatched at the position of the first append to its blob;
+        other items keep their order."""
+        by_blob: dict[tuple[str, str], list[AsyncAppend]] = {}
+        ordered: list = []
+        for item in items:
+            if isinstance(item, AsyncAppend):
+                key = (item.dst_container, item.src_fname)
+                if key not in by_blob:
+                    by_blob[key] = []
+                    ordered.append(key)
+                by_blob[key].append(item)
+            else:
+                ordered.append(item)
+
+        merged: list = []
+        for entry in ordered:
+            if isinstance(entry, tuple):
+                merged.extend(cls._merge_appends(by_blob[entry]))
+            else:
+                merged.append(entry)
+        return merged
+
     def _async_upload(
         self,
         action: AsyncUpload,
@@ -810,33 +1570,86 @@ class AsyncCloudConnector(CloudConnector):
         """A wrapper to handle failure when uploading a file to the cloud asynchronously.
         We re-queue the upload if it fails if the src files still exist.
         This method is called on a thread from the ThreadPoolExecutor."""
+        if not self._breaker_allows():
+            self._breaker_defer(action)
+            return
+
+        # We created a temporary directory for the files in each upload_to_container call that was 
+        # batched into this action (if delete_src); each is deleted once all its files are uploaded.
+        tmp_dirs = {file.parent for file in action.src_files}
+        bucket = self._get_bucket(action.dst_container)
+        bucket.acquire(len(action.src_files), self._stop_event)
         try:
             logger.debug(f"_async_upload with delete_src={action.delete_src}, "
                          f"iteration {action.iteration} for {action.src_files}")
-            super().upload_to_container(action.dst_container, 
-                                        action.src_files, 
-                                        action.delete_src, 
-                                        action.storage_tier)
-            if action.delete_src:
-                # We created a temporary directory for the files in upload_to_cloud - delete it now
-                tmp_dir = action.src_files[0].parent
-                if tmp_dir.exists() and tmp_dir.is_dir():
-                    shutil.rmtree(tmp_dir)
-                else:
-                    logger.error(f"{root_cfg.RAISE_WARN()}Temporary directory {tmp_dir} does not exist")
+            upload_container = self._validate_container(action.dst_container)
+            failures = self._upload_files(upload_container, 
+                                          action.src_files, 
+                                          action.delete_src, 
+                                          action.storage_tier.value,
+                                          self._upload_timeout(action.dst_container))
+            if any(self._is_throttled(e) for e in failures.values()):
+                logger.info(f"Cloud throttled uploads to {action.dst_container}; "
+                            f"slowing to {bucket.rate / 2:.1f} files/s")
+                bucket.decrease()
+            else:
+                bucket.increase()
+            if failures:
+                # Only retry the files that failed; the rest of the batch has been uploaded
+                action.src_files = list(failures)
+                raise next(iter(failures.values()))
+            self._breaker_record(success=True)
         except Exception as e:
+            self._breaker_record(success=False)
             # Check all the src_files still exist and drop any that don't
             logger.warning(f"Upload failed for {action.src_files} on iter {action.iteration}: {e!s}")
-            for file in action.src_files:
-                if not file.exists():
-                    action.src_files.remove(file)
+            action.src_files = [file for file in action.src_files if file.exists()]
 
             if action.src_files:
                 # Re-queue the upload if any src_files still exist
-                action.iteration += 1
-                self._upload_queue.put(action)
-                # Back off for a bit before re-trying the upload
-                sleep(2 * action.iteration)
+                self._requeue(action, str(action.src_files))
+
+        if action.delete_src:
+            for tmp_dir in tmp_dirs - {file.parent for file in action.src_files}:
+                if tmp_dir.exists() and tmp_dir.is_dir():
+                    shutil.rmtree(tmp_dir)
+                else:
+                    logger.error(f"{root_cfg.RAISE_WARN()}Temporary directory {tmp_dir} does not exist")
+
+    def _upload_file(
+        self,
+        upload_container: ContainerClient,
+        file: Path,
+        delete_src: bool,
+        blob_tier: StandardBlobTier,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """Upload a single file, recording how long it took.
+        Files too large for a single request are uploaded in blocks, so they are neither timed nor given 
+        the timeout, which is based on the time taken by single-request uploads."""
+        try:
+            single_put = file.stat().st_size <= root_cfg.CLOUD_MAX_SINGLE_PUT_SIZE
+        except FileNotFoundError:
+            # Let CloudConnector._upload_file() report the missing file
+            single_put = False
+        start_time = monotonic()
+        CloudConnector._upload_file(self, upload_container, file, delete_src, blob_tier, 
+                                    timeout if single_put else None)
+        if single_put:
+            # Only successful uploads are a guide to how long an upload should take
+            duration = monotonic() - start_time
+            with self._upload_durations_lock:
+                self._upload_durations.setdefault(upload_container.container_name, 
+                                                  deque(maxlen=UPLOAD_STATS_WINDOW)).append(duration)
+
+    def _upload_timeout(self, container: str) -> Optional[float]:
+        """Return the timeout for single-request uploads to the container, or None until enough uploads
+        have been timed."""
+        with self._upload_durations_lock:
+            durations = list(self._upload_durations.get(container, ()))
+        if len(durations) < UPLOAD_TIMEOUT_MIN_SAMPLES:
+            return None
+        return min(UPLOAD_TIMEOUT_MAX, max(UPLOAD_TIMEOUT_MIN, 2 * self._p95(durations)))
 
     def _async_append(
         self,
@@ -845,73 +1658,186 @@ class AsyncCloudConnector(CloudConnector):
         """A wrapper to handle failure when uploading append data to the cloud asynchronously.
         We re-queue the append if it fails.
         This method is called on a thread from the ThreadPoolExecutor."""
+        if not self._breaker_allows():
+            self._breaker_defer(action)
+            return
+
+        data: Optional[io.BytesIO] = None
         try:
             logger.debug(f"_async_append iteration {action.iteration} for {action.src_fname}")
 
             target_container = self._validate_container(action.dst_container)
             blob_client = target_container.get_blob_client(action.src_fname)
-
-            if not blob_client.exists():
-                blob_client.create_append_blob()
+            blob_key = (action.dst_container, action.src_fname)
+            header_hash = hashlib.sha256(action.data[0].strip().encode()).digest()
+            encoded = "".join(action.data).encode("utf-8")
+
+            if action.resume_pos is not None:
+                # A previous attempt created the blob (if need be), checked the headers and appended
+                # the data up to resume_pos
+                start = action.resume_pos
+            elif self._create_append_blob_if_missing(blob_client, "/".join(blob_key)):
                 # Include the Headers
-                data_to_append = "".join(action.data[:])
+                start = 0
             else:
-                if action.safe_mode and not self._headers_match(blob_client, action.data[0]):
+                if (action.safe_mode and 
+                    self._header_hashes.get(blob_key) != header_hash and
+                    not self._headers_match(blob_client, action.data[0])):
                     # We bin out rather than set inconsistent fields
                     logger.error(
                         f"{root_cfg.RAISE_WARN()}Failed due to inconsistent headers: local={action.data[0]}"
                     )
+                    # The cloud itself responded, so this doesn't count against the breaker
+                    self._breaker_record(success=True)
                     return
-                # Drop the Headers in the first line so we don't have repeat header rows
-                data_to_append = "".join(action.data[1:])
+                # Skip the Headers in the first line so we don't have repeat header rows
+                start = len(action.data[0].encode("utf-8"))
 
             # Append the data
-            blob_client.append_block(data_to_append)
+            data = io.BytesIO(encoded)
+            data.seek(start)
+            self._append_block(blob_client, "/".join(blob_key), data)
+            self._header_hashes[blob_key] = header_hash
+            self._breaker_record(success=True)
         except Exception as e:
+            self._breaker_record(success=False)
             logger.warning(f"Upload failed for {action.src_fname} on iter {action.iteration}: {e!s}")
-
-            # Failsafe
-            if action.iteration > 100:
-                logger.error(f"Upload failed for {action.src_fname} too many times; giving up")
-                return
+            if data is not None:
+                # Resume after the blocks that were appended, rather than appending them again
+                action.resume_pos = data.tell()
 
             # Re-queue the upload @@@ but only if it was a transient failure!
-            action.iteration += 1
-            self._upload_queue.put(action)
-            # Back off for a bit before re-trying the upload
-            sleep(2 * action.iteration)
+            self._requeue(action, action.src_fname)
+
+    def _requeue(self, action: AsyncUpload | AsyncAppend, description: str) -> None:
+        """Back off and then put a failed action back on the upload queue, unless it has already been
+        retried ASYNC_MAX_RETRIES times.
+
+        We sleep before re-queuing so that this worker holds its slot for the backoff, rather than the
+        retry being picked up straight away. Full jitter stops failed actions retrying in lock-step."""
+        if action.iteration >= ASYNC_MAX_RETRIES:
+            logger.error(f"{root_cfg.RAISE_WARN()}Upload failed for {description} too many times; giving up")
+            return
+
+        action.iteration += 1
+        self._retry_count += 1
+        backoff = min(ASYNC_MAX_BACKOFF, ASYNC_BASE_BACKOFF * 2 ** action.iteration)
+        self._stop_event.wait(random.uniform(0, backoff))
+        self._requeue_action(action)
+
+    @staticmethod
+    def _p95(durations: list[float]) -> float:
+        """Return the 95th percentile of the durations, or 0 if there are none."""
+        if len(durations) > 1:
+            return statistics.quantiles(durations, n=20, method="inclusive")[-1]
+        return durations[0] if durations else 0.0
+
+    def _get_bucket(self, container: str) -> TokenBucket:
+        """Return the upload rate limiter for a container."""
+        with self._buckets_lock:
+            if container not in self._buckets:
+                self._buckets[container] = TokenBucket()
+            return self._buckets[container]
+
+    @staticmethod
+    def _is_throttled(e: Exception) -> bool:
+        """Return True if the exception is the cloud asking us to slow down."""
+        return isinstance(e, HttpResponseError) and e.status_code in THROTTLE_STATUS_CODES
+
+    def _breaker_allows(self) -> bool:
+        """Return True if the circuit breaker allows an action to call the cloud.
+        Once the cooldown has passed, a single probe action is allowed through."""
+        with self._breaker_lock:
+            if self._breaker_opened_at is None:
+                return True
+            if self._breaker_probing or monotonic() - self._breaker_opened_at < BREAKER_COOLDOWN:
+                return False
+            self._breaker_probing = True
+            return True
+
+    def _breaker_record(self, success: bool) -> None:
+        """Record the outcome of a call to the cloud, opening or closing the circuit breaker."""
+        with self._breaker_lock:
+            self._breaker_probing = False
+            if success:
+                if self._breaker_opened_at is not None:
+                    logger.info("Cloud connection recovered; closing circuit breaker")
+                self._breaker_failures = 0
+                self._breaker_opened_at = None
+                return
+            self._breaker_failures += 1
+            if self._breaker_failures >= BREAKER_FAILURE_THRESHOLD:
+                if self._breaker_opened_at is None:
+                    logger.warning(f"{self._breaker_failures} consecutive cloud failures; "
+                                   f"pausing uploads for {BREAKER_COOLDOWN}s")
+                self._breaker_opened_at = monotonic()
+
+    def _breaker_defer(self, action: AsyncUpload | AsyncAppend) -> None:
+        """Hold an action while the circuit breaker is open and then re-queue it.
+        The action's iteration is not incremented as no attempt was made."""
+        with self._breaker_lock:
+            remaining = 0.0
+            if self._breaker_opened_at is not None:
+                remaining = BREAKER_COOLDOWN - (monotonic() - self._breaker_opened_at)
+        self._stop_event.wait(max(remaining, 1.0))
+        self._requeue_action(action)
 
 
     def do_work(self) -> None:
         """Process the upload queue."""
         while not self._stop_requested:
+            batch = [self._upload_queue.get(block=True)]
+            if batch[0] is None:
+                # Shutdown sentinel; don't go looking for more work
+                logger.debug("Queue flushed")
+                break
+            undispatched = 0
             try:
-                queue_item = self._upload_queue.get(block=True)
-
-                if isinstance(queue_item, AsyncAppend):
-                    self.futures.append(self._worker_pool.submit(self._async_append, queue_item))
-                elif isinstance(queue_item, AsyncUpload):
-                    self.futures.append(self._worker_pool.submit(self._async_upload, queue_item))
+                # If work is backing up, drain what is already queued so that appends to the same blob
+                # (eg re-queued retries) go out as one append_block. A lone item is dispatched immediately.
+                while len(batch) < MAX_DISPATCH_BATCH:
+                    try:
+                        batch.append(self._upload_queue.get_nowait())
+                    except Empty:
+                        break
+                if len(batch) > 1:
+                    batch_items = self._merge_queued_appends(batch)
+                    # Appends merged into another action are finished with
+                    self._release_actions(len(batch) - len(batch_items))
+                    # Dispatch the (latency-sensitive) appends ahead of the uploads; the sort is stable
+                    # so each kind keeps its queue order.
+                    batch_items.sort(key=lambda item: isinstance(item, AsyncUpload))
                 else:
-                    logger.debug("Queue flushed")
-                    assert self._stop_requested
-
-                self._upload_queue.task_done()
+                    batch_items = batch
+                undispatched = sum(1 for item in batch_items if item is not None)
+
+                for queue_item in batch_items:
+                    future: Optional[Future] = None
+                    if isinstance(queue_item, AsyncAppend):
+                        future = self._append_pool.submit(self._async_append, queue_item)
+                    elif isinstance(queue_item, AsyncUpload):
+                        future = self._worker_pool.submit(self._async_upload, queue_item)
+                    else:
+                        logger.debug("Queue flushed")
+                        assert self._stop_requested
+
+                    if future is not None:
+                        undispatched -= 1
+                        self.futures.add(future)
+                        future.add_done_callback(self._future_done)
             except Exception as e:
-                logger.error(f"{root_cfg.RAISE_WARN()}Error during do_work execution on {queue_item}: {e!s}")
+                logger.error(f"{root_cfg.RAISE_WARN()}Error during do_work execution on {batch}: {e!s}")
+                # Actions we failed to dispatch won't complete, so stop counting them
+                self._release_actions(undispatched)
         
         logger.info("do_work completed")
 
-    def monitor_futures(self) -> None:
-        """Monitor the futures to see if they have completed."""
-        while not self._stop_requested:
-            for future in as_completed(self.futures):
-                try:
-                    future.result()
-                    # Remove the future from the list so we don't leak memory
-                    self.futures.remove(future)
-                except Exception as e:
-                    logger.error(f"{root_cfg.RAISE_WARN()}Error during future execution: {e!s}")
-            sleep(1)  # Small delay to avoid busy-waiting
+    def _future_done(self, future: Future) -> None:
+        """Callback run as each upload / append task completes; stops self.futures growing unbounded."""
+        self.futures.discard(future)
+        # A task that failed will have re-queued its action, which then holds its own place in the queue
+        self._release_actions(1)
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"{root_cfg.RAISE_WARN()}Error during future execution: {future.exception()!s}")
 
 
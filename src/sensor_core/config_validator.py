@@ -29,6 +29,10 @@ class ValidationRule(ABC):
         """
         raise NotImplementedError("Subclasses must implement the validate method.")
 
+    def reset(self) -> None:
+        """Clear any state cached by the rule; called at the start of each validate_trees() run."""
+        pass
+
 ###########################################################################################################
 # Start with the device-level validation rules.
 ###########################################################################################################
@@ -42,13 +46,13 @@ class Rule1_outputs_not_empty(ValidationRule):
                 f"Outputs list is empty in {dpnode}: "
                 "all DPtree nodes must have at least one output.")
         
-        for stream in outputs:
+        for position, stream in enumerate(outputs):
             if not isinstance(stream, Stream):
                 return False, (
                     f"Outputs list contains non-Stream object in {dpnode}: "
                     "all DPtree nodes must have at least one output of type Stream.")
             # The stream_index must match the location in the outputs list
-            if stream.index != outputs.index(stream):
+            if stream.index != position:
                 return False, (
                     f"The Stream with index {stream.index} is not at that position in the outputs array. "
                     f"Make sure that Streams are declared in the right order, starting with index 0. "
@@ -100,22 +104,50 @@ class Rule4_cloud_container_specified(ValidationRule):
         return True, ""
 
 # Rule5: check that all cloud_containers exist in the blobstore using cloud_connector.container_exists()
+# Many streams share a container, so we remember the containers that we've already found during a
+# validate_trees() run; only missing containers are re-checked.  The set is seeded with a single
+# list_containers() call; if listing isn't permitted we fall back to probing each container individually.
 class Rule5_cloud_container_exists(ValidationRule):
+    def __init__(self) -> None:
+        self.existing_containers: set[str] = set()
+        self.listed = False
+
+    def reset(self) -> None:
+        # The cloud (or CLOUD_TYPE) may have changed since the last run, so list the containers again
+        self.existing_containers = set()
+        self.listed = False
+
     def validate(self, dpnode: DPnode) -> tuple[bool, str]:
-        cc = CloudConnector.get_instance(root_cfg.CLOUD_TYPE)
         outputs = dpnode.get_config().outputs
         if outputs:
             for stream in outputs:
                 if stream.format not in api.DATA_FORMATS:
                     # Check the Datastream's cloud_container exists
                     if (stream.cloud_container is not None and 
-                        not cc.container_exists(stream.cloud_container)):
+                        not self.container_exists(stream.cloud_container)):
                         return False, (
                             f"cloud_container {stream.cloud_container} does not exist in "
                             f"{dpnode}"
                         )
         return True, ""
 
+    def container_exists(self, container: str) -> bool:
+        if container in self.existing_containers:
+            return True
+        cc = CloudConnector.get_instance(root_cfg.CLOUD_TYPE)
+        if not self.listed:
+            self.listed = True
+            try:
+                self.existing_containers.update(cc.list_containers())
+            except Exception as e:
+                logger.debug(f"Unable to list containers; checking each container instead: {e!s}")
+            if container in self.existing_containers:
+                return True
+        if cc.container_exists(container):
+            self.existing_containers.add(container)
+            return True
+        return False
+
 # Rule 6: any datastream of type log, csv or df must have output fields set
 class Rule6_csv_output_fields(ValidationRule):
     def validate(self, dpnode: DPnode) -> tuple[bool, str]:
@@ -135,32 +167,39 @@ class Rule7_reserved_fieldnames(ValidationRule):
         outputs = dpnode.get_config().outputs
         if outputs:
             for stream in outputs:
-                fields = stream.fields
-                if fields is not None:
-                    for field in fields:
-                        if field in api.ALL_RECORD_ID_FIELDS:
-                            return False, (
-                                f"output field {field} is reserved in {dpnode} for {stream.type_id}"
-                            )
+                if stream.fields:
+                    reserved = api.ALL_RECORD_ID_FIELDS_SET.intersection(stream.fields)
+                    if reserved:
+                        return False, (
+                            f"output field(s) {sorted(reserved)} are reserved in {dpnode} "
+                            f"for {stream.type_id}"
+                        )
         return True, ""
 
 
+# Rules are run in order of cost: the in-memory checks first, so that a node that fails one of them
+# is reported without the cloud lookups in Rule5, which must stay last (and after Rule4).
 RULE_SET: list[ValidationRule] = [
     Rule1_outputs_not_empty(),
     Rule2_sensor_type_model_set(),
     Rule3_no_underscore_in_type_id(),
-    Rule4_cloud_container_specified(),
-    Rule5_cloud_container_exists(),
     Rule6_csv_output_fields(),
     Rule7_reserved_fieldnames(),
+    Rule4_cloud_container_specified(),
+    Rule5_cloud_container_exists(),
 ]
 
-def validate_trees(dptrees: list[DPtree]) -> tuple[bool, list[str]]:
+def validate_tree(dptree: DPtree, fail_fast: bool = False) -> tuple[bool, list[str]]:
+    """Validate a single DPtree; see validate_trees()."""
+    return validate_trees([dptree], fail_fast=fail_fast)
+
+def validate_trees(dptrees: list[DPtree], fail_fast: bool = False) -> tuple[bool, list[str]]:
     """
     Validate the configuration using all added rules.
 
     Args:
         config (dict): The configuration to validate.
+        fail_fast (bool): If True, return as soon as the first error is found.
 
     Returns:
         tuple: (bool, list) where the boolean indicates overall success (True) or failure (False),
@@ -172,19 +211,19 @@ def validate_trees(dptrees: list[DPtree]) -> tuple[bool, list[str]]:
     if not dptrees:
         return False, ["No tree provided for validation."]
 
-    if isinstance(dptrees, DPtree):
-        dptrees = [dptrees]    
+    for rule in RULE_SET:
+        rule.reset()
 
     #######################################################################################################
     # Run cross-tree validation rules
     #######################################################################################################
     # Build an index of all sensor_type+sensor_index combinations and check for duplicates
-    sensor_index_map: dict[str, DPtree] = {}
+    sensor_index_map: dict[tuple[api.SENSOR_TYPE, int], DPtree] = {}
     for dptree in dptrees:
         config = dptree.sensor.get_config()
         assert isinstance(config, SensorCfg)
         sensor_cfg: SensorCfg = config
-        sensor_type_index = f"{sensor_cfg.sensor_type}_{sensor_cfg.sensor_index}"
+        sensor_type_index = (sensor_cfg.sensor_type, sensor_cfg.sensor_index)
         if sensor_type_index in sensor_index_map:
             is_valid = False
             errors.append(
@@ -202,18 +241,27 @@ def validate_trees(dptrees: list[DPtree]) -> tuple[bool, list[str]]:
     #################################################################################################
     if is_valid:
         for dptree in dptrees:
-            for rule in RULE_SET:
-                try:
-                    for dpnode in dptree._nodes.values():
+            # A rule that raises an exception is not run on the rest of the tree's nodes
+            broken_rules: set[ValidationRule] = set()
+            for dpnode in dptree._nodes.values():
+                for rule in RULE_SET:
+                    if rule in broken_rules:
+                        continue
+                    try:
                         success, error_message = rule.validate(dpnode)
-                        if not success:
-                            is_valid = False
-                            errors.append(error_message)
-                except Exception as e:
-                    is_valid = False
-                    errors.append(
-                        f"Error validating rule {rule.__class__.__name__}: {e!s}"
-                    )
+                    except Exception as e:
+                        broken_rules.add(rule)
+                        success, error_message = False, (
+                            f"Error validating rule {rule.__class__.__name__}: {e!s}"
+                        )
+                    if not success:
+                        is_valid = False
+                        errors.append(error_message)
+                        if fail_fast:
+                            return is_valid, errors
+                        # Stop at the node's first failure; later rules (including Rule5's cloud
+                        # lookups) would mostly report knock-on errors from the same misconfiguration.
+                        break
         
     return is_valid, errors
 
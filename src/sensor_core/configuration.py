@@ -55,6 +55,34 @@ WATCHDOG_FREQUENCY: float = 1
 # threads to complete. It also limits the duration of any recordings
 #   - max_recording_timer
 
+############################################################################################
+# Cloud transfer settings
+#
+# Passed to the Azure SDK by the CloudConnector. Larger blocks and more parallel connections
+# mean fewer round trips on large files, at the cost of buffering up to 
+# CLOUD_MAX_CONCURRENCY * CLOUD_MAX_BLOCK_SIZE bytes per transfer; the defaults are sized for a RPi.
+############################################################################################
+# Number of parallel connections used to upload or download a single blob
+CLOUD_MAX_CONCURRENCY: int = 4
+# Size of each block when a blob upload is split into blocks
+CLOUD_MAX_BLOCK_SIZE: int = 8 * 1024 * 1024
+# Blobs up to this size are uploaded in a single PUT rather than split into blocks
+CLOUD_MAX_SINGLE_PUT_SIZE: int = 64 * 1024 * 1024
+# Blobs up to this size are downloaded in a single GET; larger blobs are fetched in chunks of
+# CLOUD_MAX_CHUNK_GET_SIZE (the SDK's default chunk is 4 MiB, which costs a round trip every 4 MiB)
+CLOUD_MAX_SINGLE_GET_SIZE: int = 32 * 1024 * 1024
+CLOUD_MAX_CHUNK_GET_SIZE: int = 8 * 1024 * 1024
+# Number of files uploaded in parallel by a single upload_to_container call
+CLOUD_UPLOAD_WORKERS: int = 8
+# Number of files downloaded in parallel by download_container; each download also uses up to 
+# CLOUD_MAX_CONCURRENCY connections, so large blobs parallelise within the file
+CLOUD_DOWNLOAD_WORKERS: int = 4
+# Maximum number of keep-alive HTTPS connections held open to the blobstore
+CLOUD_CONNECTION_POOL_SIZE: int = 64
+# Number of times the Azure SDK retries a failed request, and the initial backoff in seconds
+CLOUD_RETRY_TOTAL: int = 5
+CLOUD_RETRY_INITIAL_BACKOFF: int = 1
+
 
 ############################################################################################
 #
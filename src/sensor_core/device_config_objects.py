@@ -19,7 +19,7 @@ from sensor_core.utils import utils_clean
 FAILED_TO_LOAD = "Not set"
 
 
-@dataclass
+@dataclass(slots=True)
 class Configuration:
     """Utility super class"""
 
@@ -41,7 +41,7 @@ class Configuration:
 ############################################################################################
 # Wifi configuration
 ############################################################################################
-@dataclass
+@dataclass(slots=True)
 class WifiClient:
     ssid: str
     priority: int
@@ -50,7 +50,7 @@ class WifiClient:
 ############################################################################################
 # Configuration for a device
 ############################################################################################
-@dataclass
+@dataclass(slots=True)
 class DeviceCfg(Configuration):
     """Configuration for a device"""
 
@@ -6,7 +6,7 @@ from sensor_core import configuration as root_cfg
 
 logger = root_cfg.setup_logger("sensor_core")
 
-@dataclass
+@dataclass(slots=True)
 class Stream:
     """Defines the format and fields present in a datastream coming from a DPtreeNode."""
     # Human-understandable description of the data in the stream
@@ -47,7 +47,7 @@ class Stream:
         """
         return file_naming.create_data_id(root_cfg.my_device_id, sensor_index, self.type_id, self.index)
 
-@dataclass
+@dataclass(slots=True)
 class DPtreeNodeCfg:
     """Defines the configuration for a node in the DPtree.
     SensorCfg & DataProcessorCfg inherit from this class.
@@ -58,7 +58,7 @@ class DPtreeNodeCfg:
     description: str
 
 
-@dataclass
+@dataclass(slots=True)
 class SensorCfg(DPtreeNodeCfg):
     """Defines the configuration for a concrete Sensor class implementation.
     Can be subclassed to add additional configuration parameters specific to the Sensor class.
@@ -82,7 +82,7 @@ class SensorCfg(DPtreeNodeCfg):
     sensor_model: str = root_cfg.FAILED_TO_LOAD
 
 
-@dataclass
+@dataclass(slots=True)
 class DataProcessorCfg(DPtreeNodeCfg):
     """Defines the configuration for a concrete DataProcessor class implementation.
     Can be subclassed to add additional configuration parameters specific to the DataProcessor class."""
@@ -562,7 +562,7 @@ class DPnode():
                 if (
                     (stream.fields is not None)
                     and (field not in stream.fields)
-                    and (field not in api.ALL_RECORD_ID_FIELDS)
+                    and (field not in api.ALL_RECORD_ID_FIELDS_SET)
                 ):
                     logger.warning(
                         f"{field} in output from {data_id} "
@@ -138,15 +138,30 @@ def get_file_datetime(fname: Path | str) -> datetime:
 
     fname = fname.stem
 
-    # Check that the filename has at least 4 "_"
-    if fname.count("_") < 4:
+    # Check that the filename has at least 5 "_"
+    if fname.count("_") < 5:
         logger.warning(f"Invalid filename format - too few _ in {fname}")
         return datetime.min
 
     # Extract the fields from the filename, parsing with the "_" delimiter
+    # The start_time follows V3_{datastream_type_id}_{device_id}_{sensor_id}_{stream_index}
     fields = fname.split("_")
-    start_time = api.utc_from_str(fields[4])
+    start_time = api.utc_from_str(fields[5])
     return start_time
+
+def get_file_timestamp_str(fname: Path | str) -> Optional[str]:
+    """Get the start_time field from a record filename as a string, without parsing it.
+
+    The timestamp is fixed width (see api.utc_to_fname_str), so these strings sort chronologically
+    and can be compared directly; this is much cheaper than get_file_datetime() when filtering long 
+    lists of filenames. Returns None if the filename has too few fields."""
+    if isinstance(fname, Path):
+        fname = fname.name
+
+    fields = fname.split("_", 6)
+    if len(fields) < 6:
+        return None
+    return fields[5].split(".", 1)[0]
     
 
 def get_record_filename(
@@ -36,6 +36,17 @@ def create_root_working_dir(path: Path) -> None:
 ############################################################
 # Dataclass display utility
 ############################################################
+# Field names of each dataclass type displayed so far, so that fields() is only walked once per type
+_FIELD_NAMES_CACHE: dict[type, tuple[str, ...]] = {}
+
+def _field_names(obj: Any) -> tuple[str, ...]:
+    """Return the names of the fields of a dataclass (or dataclass instance), cached by type."""
+    cls = obj if isinstance(obj, type) else type(obj)
+    names = _FIELD_NAMES_CACHE.get(cls)
+    if names is None:
+        names = _FIELD_NAMES_CACHE.setdefault(cls, tuple(f.name for f in fields(obj)))
+    return names
+
 def display_dataclass(obj: Any, indent: int=0) -> str:
     """
     Recursively display the contents of a dataclass hierarchy.
@@ -67,27 +78,27 @@ def display_dataclass(obj: Any, indent: int=0) -> str:
 
     result = ""
 
-    for field in fields(obj):
-        value = getattr(obj, field.name)
+    for name in _field_names(obj):
+        value = getattr(obj, name)
         if value is None:
             # Skip empty fields
             continue
         elif is_dataclass(value):
             # Recursively display nested dataclass
-            result += f"{fb(indent)}{field.name}::\n{display_dataclass(value, indent + 1)}{nlb(indent)}\n"
+            result += f"{fb(indent)}{name}::\n{display_dataclass(value, indent + 1)}{nlb(indent)}\n"
         elif isinstance(value, list) and all(isinstance(item, (str, float, int)) for item in value):
             # Treat lists of simple types as a single block
-            result += f"{fb(indent)}{field.name}={value}{bb(indent)}\n"
+            result += f"{fb(indent)}{name}={value}{bb(indent)}\n"
         elif isinstance(value, list):
             # Handle lists, including lists of dataclasses
-            result += f"{fb(indent)}{field.name}::\n"
+            result += f"{fb(indent)}{name}::\n"
             for i, item in enumerate(value):
                 result += f"{id(indent + 1)}[{i}]\n"
                 result += f"{display_dataclass(item, indent + 2)}"
             result += f"{nlb(indent)}\n"
         else:
             # Display simple fields
-            result += f"{fb(indent)}{field.name}={value!r}{bb(indent)}\n"
+            result += f"{fb(indent)}{name}={value!r}{bb(indent)}\n"
     return result
 
 
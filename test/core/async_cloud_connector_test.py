@@ -0,0 +1,291 @@
+import threading
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from azure.core.exceptions import HttpResponseError, ResourceExistsError
+from azure.core.pipeline.transport._bigger_block_size_http_adapters import BiggerBlockSizeHTTPAdapter
+from sensor_core import api, cloud_connector, file_naming
+from sensor_core import configuration as root_cfg
+from sensor_core.cloud_connector import (
+    AsyncAppend,
+    AsyncCloudConnector,
+    AsyncUpload,
+    CloudConnector,
+    TokenBucket,
+)
+from sensor_core.device_config_objects import Keys
+
+logger = root_cfg.setup_logger("sensor_core")
+root_cfg.TEST_MODE = root_cfg.MODE.TEST
+
+# A well-formed connection string; the BlobServiceClient is created from it but never called
+FAKE_CONNECTION_STRING = ("DefaultEndpointsProtocol=https;AccountName=fake;AccountKey=ZmFrZQ==;"
+                          "EndpointSuffix=core.windows.net")
+
+
+class FakeBlobClient:
+    def __init__(self, container: "FakeContainerClient", blob_name: str) -> None:
+        self.container = container
+        self.blob_name = blob_name
+
+    def upload_blob(self, data, length: int, **kwargs) -> None:
+        self.container.upload_calls.append(self.blob_name)
+        if self.container.upload_errors:
+            raise self.container.upload_errors.pop(0)
+        self.container.blobs[self.blob_name] = data.read()
+
+    def create_append_blob(self, **kwargs) -> None:
+        if self.blob_name in self.container.blobs:
+            raise ResourceExistsError("Blob already exists")
+        self.container.blobs[self.blob_name] = b""
+
+    def append_block(self, data: bytes) -> None:
+        self.container.append_calls += 1
+        if self.container.append_errors:
+            error = self.container.append_errors.pop(0)
+            if error is not None:
+                raise error
+        self.container.append_blocks.append(data)
+        self.container.blobs[self.blob_name] += data
+
+
+class FakeContainerClient:
+    """Stands in for the Azure ContainerClient, holding the blobs in memory."""
+    def __init__(self, container_name: str) -> None:
+        self.container_name = container_name
+        self.blobs: dict[str, bytes] = {}
+        self.upload_calls: list[str] = []
+        self.append_calls = 0
+        # Errors to raise from the next upload_blob() calls
+        self.upload_errors: list[Exception] = []
+        # Errors to raise from the next append_block() calls (None for a call that succeeds)
+        self.append_errors: list[Exception | None] = []
+        self.append_blocks: list[bytes] = []
+
+    def get_blob_client(self, blob_name: str) -> FakeBlobClient:
+        return FakeBlobClient(self, blob_name)
+
+
+@pytest.fixture
+def container() -> FakeContainerClient:
+    return FakeContainerClient("sensor-core-upload")
+
+
+@pytest.fixture
+def cc(monkeypatch: pytest.MonkeyPatch, container: FakeContainerClient) -> Iterator[AsyncCloudConnector]:
+    monkeypatch.setattr(root_cfg, "keys", Keys(cloud_storage_key=FAKE_CONNECTION_STRING))
+    # Retry straight away rather than backing off
+    monkeypatch.setattr(cloud_connector, "ASYNC_BASE_BACKOFF", 0.0)
+    connector = AsyncCloudConnector()
+    monkeypatch.setattr(connector, "_validate_container", lambda name: container)
+    yield connector
+    connector.shutdown()
+
+
+@pytest.fixture
+def sync_cc(monkeypatch: pytest.MonkeyPatch, container: FakeContainerClient) -> CloudConnector:
+    monkeypatch.setattr(root_cfg, "keys", Keys(cloud_storage_key=FAKE_CONNECTION_STRING))
+    connector = CloudConnector()
+    monkeypatch.setattr(connector, "_validate_container", lambda name: container)
+    return connector
+
+
+def wait_for_queue(cc: AsyncCloudConnector, timeout: float = 30) -> None:
+    """Call block_until_queue_empty(), failing the test rather than hanging if it doesn't return."""
+    waiter = threading.Thread(target=cc.block_until_queue_empty, daemon=True)
+    waiter.start()
+    waiter.join(timeout)
+    assert not waiter.is_alive(), f"Queue not emptied; {cc._queued_actions} actions outstanding"
+
+
+def write_csv(rows: list[str], name: str | None = None) -> Path:
+    fname = file_naming.get_temporary_filename(api.FORMAT.CSV)
+    if name is not None:
+        fname = fname.parent / name
+    fname.write_text("".join(["col1,col2\n", *rows]))
+    return fname
+
+
+class Test_async_cloud_connector:
+    @pytest.mark.quick
+    def test_merge_appends(self) -> None:
+        actions = [
+            AsyncAppend("c", "blob.csv", False, ["h\n", "1\n"], iteration=90),
+            AsyncAppend("c", "blob.csv", False, ["h\n", "2\n"], safe_mode=True),
+            AsyncAppend("c", "blob.csv", False, ["other\n", "3\n"]),
+        ]
+        merged = AsyncCloudConnector._merge_appends(actions)
+        # Appends sharing a header are merged, with the second header dropped
+        assert len(merged) == 2
+        assert merged[0].data == ["h\n", "1\n", "2\n"]
+        assert merged[0].safe_mode
+        # The merged append takes the lowest retry count of its parts
+        assert merged[0].iteration == 0
+        # A change of header starts a new append
+        assert merged[1].data == ["other\n", "3\n"]
+
+    @pytest.mark.quick
+    def test_merge_queued_appends(self) -> None:
+        upload = AsyncUpload("c", [Path("a.jpg")], False)
+        items = [
+            AsyncAppend("c", "x.csv", False, ["h\n", "1\n"]),
+            upload,
+            AsyncAppend("c", "y.csv", False, ["h\n", "2\n"]),
+            AsyncAppend("c", "x.csv", False, ["h\n", "3\n"]),
+        ]
+        merged = AsyncCloudConnector._merge_queued_appends(items)
+        # Appends to x.csv are merged at the position of the first; other items keep their order
+        assert [getattr(item, "src_fname", None) for item in merged] == ["x.csv", None, "y.csv"]
+        assert merged[0].data == ["h\n", "1\n", "3\n"]
+        assert merged[1] is upload
+
+    @pytest.mark.quick
+    def test_append_drops_repeated_headers(self, cc: AsyncCloudConnector,
+                                           container: FakeContainerClient) -> None:
+        blob_name = "append_test.csv"
+        for rows in (["1,2\n"], ["3,4\n"]):
+            cc.append_to_cloud(container.container_name, write_csv(rows, blob_name), delete_src=True)
+        wait_for_queue(cc)
+        # Both appends were coalesced into one append that created the blob, with a single header
+        assert container.blobs[blob_name] == b"col1,col2\n1,2\n3,4\n"
+        assert container.append_calls == 1
+
+        cc.append_to_cloud(container.container_name, write_csv(["5,6\n"], blob_name), delete_src=True)
+        wait_for_queue(cc)
+        # Appending to the existing blob drops the header line
+        assert container.blobs[blob_name] == b"col1,col2\n1,2\n3,4\n5,6\n"
+
+    @pytest.mark.quick
+    def test_large_append_resumes(self, cc: AsyncCloudConnector, container: FakeContainerClient) -> None:
+        blob_name = "large_append_test.csv"
+        # About 10MB of rows, so the append is split into three blocks
+        rows = [f"{i:09d},{i:09d}\n" for i in range(500_000)]
+        expected = "".join(["col1,col2\n", *rows]).encode()
+        # The second block fails once
+        container.append_errors = [None, HttpResponseError(message="Connection reset")]
+        cc.append_to_cloud(container.container_name, write_csv(rows, blob_name), delete_src=True)
+        wait_for_queue(cc)
+
+        # The retry resumed after the first block rather than appending it again
+        assert container.blobs[blob_name] == expected
+        assert len(container.append_blocks) == 3
+        for block in container.append_blocks:
+            # Blocks end at a line break, so another writer's block can't split a row
+            assert len(block) <= cloud_connector.MAX_APPEND_BLOCK_SIZE
+            assert block.endswith(b"\n")
+
+    @pytest.mark.quick
+    def test_breaker(self, cc: AsyncCloudConnector) -> None:
+        for _ in range(cloud_connector.BREAKER_FAILURE_THRESHOLD - 1):
+            cc._breaker_record(success=False)
+        assert cc._breaker_allows()
+
+        # Opens after BREAKER_FAILURE_THRESHOLD consecutive failures
+        cc._breaker_record(success=False)
+        assert not cc._breaker_allows()
+
+        # Once the cooldown has passed, a single probe is let through
+        assert cc._breaker_opened_at is not None
+        cc._breaker_opened_at -= cloud_connector.BREAKER_COOLDOWN
+        assert cc._breaker_allows()
+        assert not cc._breaker_allows()
+
+        # A successful probe closes the breaker
+        cc._breaker_record(success=True)
+        assert cc._breaker_opened_at is None
+        assert cc._breaker_allows()
+
+    @pytest.mark.quick
+    def test_token_bucket(self) -> None:
+        bucket = TokenBucket()
+        bucket.decrease()
+        assert bucket.rate == cloud_connector.THROTTLE_MAX_RATE / 2
+        bucket.increase()
+        assert bucket.rate == cloud_connector.THROTTLE_MAX_RATE / 2 + cloud_connector.THROTTLE_RATE_STEP
+        for _ in range(20):
+            bucket.decrease()
+        assert bucket.rate == cloud_connector.THROTTLE_MIN_RATE
+        for _ in range(100):
+            bucket.increase()
+        assert bucket.rate == cloud_connector.THROTTLE_MAX_RATE
+
+    @pytest.mark.quick
+    @pytest.mark.parametrize("status_code,throttled", [(429, True), (503, True), (500, False)])
+    def test_throttled_upload(self, cc: AsyncCloudConnector, container: FakeContainerClient,
+                              status_code: int, throttled: bool) -> None:
+        error = HttpResponseError(message=f"HTTP {status_code}")
+        error.status_code = status_code
+        container.upload_errors.append(error)
+
+        src_file = write_csv(["1,2\n"])
+        cc.upload_to_container(container.container_name, [src_file], delete_src=True)
+        wait_for_queue(cc)
+
+        # The failed upload was retried and succeeded
+        assert container.upload_calls == [src_file.name, src_file.name]
+        assert container.blobs[src_file.name] == b"col1,col2\n1,2\n"
+        assert cc.get_stats()["retry_count"] == 1
+        # Only throttling responses slow the container's upload rate
+        rate = cc._get_bucket(container.container_name).rate
+        if throttled:
+            assert rate < cloud_connector.THROTTLE_MAX_RATE
+        else:
+            assert rate == cloud_connector.THROTTLE_MAX_RATE
+
+    @pytest.mark.quick
+    def test_block_until_queue_empty(self, cc: AsyncCloudConnector, container: FakeContainerClient) -> None:
+        src_files = [write_csv([f"{i},{i}\n"]) for i in range(10)]
+        for src_file in src_files:
+            cc.upload_to_container(container.container_name, [src_file], delete_src=True)
+        append_files = [write_csv([f"{i},{i}\n"]) for i in range(5)]
+        for append_file in append_files:
+            cc.append_to_cloud(container.container_name, append_file, delete_src=True)
+        wait_for_queue(cc)
+
+        assert cc._queued_actions == 0
+        assert cc.get_stats()["queue_depth"] == 0
+        assert all(src_file.name in container.blobs for src_file in src_files)
+        assert all(append_file.name in container.blobs for append_file in append_files)
+        assert not any(src_file.exists() for src_file in src_files)
+        # Every file was timed, so the upload latency is available
+        assert cc.get_stats()["upload_latency_p95"] >= 0
+        assert len(cc._upload_durations[container.container_name]) == len(src_files)
+
+
+class Test_cloud_connector_append:
+    @pytest.mark.quick
+    def test_large_append_resumes(self, sync_cc: CloudConnector, container: FakeContainerClient) -> None:
+        blob_name = "sync_append_test.csv"
+        rows = [f"{i:09d},{i:09d}\n" for i in range(500_000)]
+        expected = "".join(["col1,col2\n", *rows]).encode()
+        src_file = write_csv(rows, blob_name)
+        # The second block fails once
+        container.append_errors = [None, HttpResponseError(message="Connection reset")]
+        assert not sync_cc.append_to_cloud(container.container_name, src_file, delete_src=True)
+
+        # The file now holds the header and just the rows that weren't appended
+        appended = container.blobs[blob_name]
+        assert appended.endswith(b"\n")
+        assert src_file.read_bytes() == b"col1,col2\n" + expected[len(appended):]
+
+        # Trying again resumes rather than appending the first block twice
+        assert sync_cc.append_to_cloud(container.container_name, src_file, delete_src=True)
+        assert container.blobs[blob_name] == expected
+        assert not src_file.exists()
+        for block in container.append_blocks:
+            assert len(block) <= cloud_connector.MAX_APPEND_BLOCK_SIZE
+            assert block.endswith(b"\n")
+
+
+class Test_cloud_connector_transport:
+    @pytest.mark.quick
+    def test_transport_matches_sdk_defaults(self, sync_cc: CloudConnector) -> None:
+        transport = sync_cc._make_transport()
+        adapter = transport.session.get_adapter("https://fake.blob.core.windows.net")
+        # Uploads are sent in 32KiB socket blocks, as on the SDK's own session
+        assert isinstance(adapter, BiggerBlockSizeHTTPAdapter)
+        assert adapter._pool_maxsize == root_cfg.CLOUD_CONNECTION_POOL_SIZE
+        assert transport.connection_config.data_block_size == cloud_connector.TRANSPORT_DATA_BLOCK_SIZE
+        assert transport.connection_config.timeout == cloud_connector.TRANSPORT_CONNECTION_TIMEOUT
+        assert transport.connection_config.read_timeout == cloud_connector.TRANSPORT_READ_TIMEOUT
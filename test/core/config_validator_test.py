@@ -0,0 +1,107 @@
+import pytest
+from example.my_sensor_example import ExampleSensor
+from sensor_core import api, config_validator
+from sensor_core import configuration as root_cfg
+from sensor_core.cloud_connector import CloudConnector
+from sensor_core.dp_config_objects import SensorCfg, Stream
+from sensor_core.dp_tree import DPtree
+
+logger = root_cfg.setup_logger("sensor_core")
+root_cfg.TEST_MODE = root_cfg.MODE.TEST
+
+
+class FakeCloudConnector:
+    """Stands in for the CloudConnector so that Rule5 can be tested without cloud credentials."""
+    def __init__(self, containers: set[str]) -> None:
+        self.containers = containers
+        self.list_calls = 0
+        self.probes = 0
+
+    def list_containers(self) -> frozenset[str]:
+        self.list_calls += 1
+        return frozenset(self.containers)
+
+    def container_exists(self, container: str) -> bool:
+        self.probes += 1
+        return container in self.containers
+
+
+@pytest.fixture
+def fake_cc(monkeypatch: pytest.MonkeyPatch) -> FakeCloudConnector:
+    cc = FakeCloudConnector({"sensor-core-upload"})
+    monkeypatch.setattr(CloudConnector, "get_instance", staticmethod(lambda type: cc))
+    return cc
+
+
+def make_tree(sensor_index: int, outputs: list[Stream]) -> DPtree:
+    cfg = SensorCfg(sensor_type=api.SENSOR_TYPE.I2C,
+                    sensor_index=sensor_index,
+                    sensor_model="ExampleSensor",
+                    description="Sensor for config_validator tests",
+                    outputs=outputs)
+    return DPtree(ExampleSensor(cfg))
+
+
+def jpg_stream(index: int = 0, container: str = "sensor-core-upload") -> Stream:
+    return Stream("Image stream", "TESTJ", index, api.FORMAT.JPG, ["temperature"],
+                  cloud_container=container)
+
+
+class Test_config_validator:
+    @pytest.mark.quick
+    def test_valid_tree(self, fake_cc: FakeCloudConnector) -> None:
+        is_valid, errors = config_validator.validate_tree(make_tree(1, [jpg_stream()]))
+        assert is_valid, errors
+        # The containers are listed once, so no container needs to be probed individually
+        assert fake_cc.list_calls == 1
+        assert fake_cc.probes == 0
+
+        # The container list is refreshed on each run rather than cached for the process
+        fake_cc.containers = set()
+        is_valid, errors = config_validator.validate_tree(make_tree(1, [jpg_stream()]))
+        assert not is_valid
+        assert fake_cc.list_calls == 2
+
+    @pytest.mark.quick
+    def test_fail_fast(self, fake_cc: FakeCloudConnector) -> None:
+        # Two trees whose streams fail Rule3 (underscore in type_id)
+        def bad_trees() -> list[DPtree]:
+            return [make_tree(i, [Stream("Bad stream", "BAD_ID", 0, api.FORMAT.LOG, ["temperature"])])
+                    for i in (1, 2)]
+
+        is_valid, errors = config_validator.validate_trees(bad_trees())
+        assert not is_valid
+        assert len(errors) == 2, errors
+
+        is_valid, errors = config_validator.validate_trees(bad_trees(), fail_fast=True)
+        assert not is_valid
+        assert len(errors) == 1, errors
+
+    @pytest.mark.quick
+    def test_node_stops_at_first_failure(self, fake_cc: FakeCloudConnector) -> None:
+        # The stream is at the wrong position (Rule1) and its container doesn't exist (Rule5)
+        tree = make_tree(1, [jpg_stream(index=1, container="no-such-container")])
+        is_valid, errors = config_validator.validate_tree(tree)
+        assert not is_valid
+        assert len(errors) == 1, errors
+        assert "is not at that position" in errors[0]
+        # Rule1 failed first, so Rule5 never called the cloud
+        assert fake_cc.list_calls == 0
+        assert fake_cc.probes == 0
+
+    @pytest.mark.quick
+    def test_rule_order(self) -> None:
+        rule_types = [type(rule) for rule in config_validator.RULE_SET]
+        # The cloud lookup runs last, after the check that a container is specified
+        assert rule_types[-1] is config_validator.Rule5_cloud_container_exists
+        assert rule_types[-2] is config_validator.Rule4_cloud_container_specified
+
+    @pytest.mark.quick
+    def test_reserved_fieldnames(self, fake_cc: FakeCloudConnector) -> None:
+        reserved = [api.RECORD_ID.TIMESTAMP.value, api.RECORD_ID.DEVICE_ID.value]
+        tree = make_tree(1, [Stream("Log stream", "TESTL", 0, api.FORMAT.LOG, ["temperature", *reserved])])
+        is_valid, errors = config_validator.validate_tree(tree)
+        assert not is_valid
+        assert len(errors) == 1, errors
+        # All the reserved fields are reported, in sorted order
+        assert f"output field(s) {sorted(reserved)} are reserved" in errors[0]
@@ -53,3 +53,24 @@ class Test_datastream:
         assert output.type_id == type_id
         assert output.sensor_index == sensor_id
         assert output.stream_index == stream_index
+
+    @pytest.mark.quick
+    def test_file_timestamp_str(self) -> None:
+        start_time = api.utc_now()
+        fnames = [
+            file_naming.get_record_filename(
+                root_cfg.EDGE_PROCESSING_DIR,
+                data_id="test_d01111111111_01_00",
+                suffix=api.FORMAT.CSV,
+                start_time=start_time + timedelta(milliseconds=offset),
+                end_time=end_time,
+            )
+            for offset, end_time in [(0, None), (1, api.utc_now()), (-1, None), (1000, api.utc_now())]
+        ]
+        # The string timestamps must sort in the same order as the parsed datetimes
+        by_str = sorted(fnames, key=lambda f: file_naming.get_file_timestamp_str(f) or "")
+        by_dt = sorted(fnames, key=file_naming.get_file_datetime)
+        assert by_str == by_dt
+        assert file_naming.get_file_datetime(fnames[0]) == file_naming.parse_record_filename(
+            fnames[0])[api.RECORD_ID.TIMESTAMP.value]
+        assert file_naming.get_file_timestamp_str("V3_test_d01111111111.csv") is None
@@ -20,6 +20,9 @@ class TestCloudConnector:
         src_files: list[Path],
         delete_src: Optional[bool] = True,
         blob_tier: Enum=BlobTier.HOT,
+    def make_uploader(
+        self, dst_container: str, storage_tier: api.StorageTier = api.StorageTier.HOT
+    ) -> Callable[[Path, bool], None]:
     def download_from_container(
         self, src_container: str, src_file: str, dst_file: Path
     def download_container(
@@ -39,14 +42,17 @@ class TestCloudConnector:
     def append_to_cloud(
         self, dst_container: str, src_file: Path, safe_mode: Optional[bool] = False
     def container_exists(self, container: str) -> bool:
+    def list_containers(self) -> frozenset[str]:
     def exists(self, src_container: str, blob_name: str) -> bool:
     def delete(self, container: str, blob_name: str) -> None:
+    def delete_many(self, container: str, blob_names: list[str]) -> None:
     def list_cloud_files(
         self,
         container: str,
         prefix: Optional[str] = None,
         suffix: Optional[str] = None,
         more_recent_than: Optional[datetime] = None,
+        max_results: Optional[int] = None,
     def get_blob_modified_time(self, container: str, blob_name: str) -> datetime:
     """
     def test_production_cloud_connector(self) -> None:
@@ -92,12 +98,25 @@ class TestCloudConnector:
         files = cc.list_cloud_files(dst_container)
         logger.debug(f"Files in container {dst_container}: {len(files)}")
         assert len(files) > 0, "No files found in cloud container after upload"
+        assert len(cc.list_cloud_files(dst_container, max_results=1)) == 1, "max_results not applied"
 
         # Test exists()
         assert cc.exists(dst_container, src_file.name), "File does not exist in cloud container"
 
+        # Test make_uploader()
+        uploader = cc.make_uploader(dst_container)
+        uploader_file = file_naming.get_temporary_filename(api.FORMAT.TXT)
+        with open(uploader_file, "w") as f:
+            f.write("This is a test file for make_uploader.")
+        uploader(uploader_file, True)
+        sleep(1)
+        assert cc.exists(dst_container, uploader_file.name), "make_uploader file does not exist in cloud"
+        assert not uploader_file.exists(), "make_uploader did not delete the source file"
+        cc.delete(dst_container, uploader_file.name)
+
         # Test container_exists()
         assert cc.container_exists(dst_container), "Container does not exist in cloud"
+        assert dst_container in cc.list_containers(), "Container not found by list_containers"
 
         # Test download_from_container()
         dst_file = file_naming.get_temporary_filename(api.FORMAT.TXT)
@@ -144,4 +163,8 @@ class TestCloudConnector:
         cc.delete(dst_container, src_file.name)
         assert not cc.exists(dst_container, src_file.name), "File still exists after delete"
 
+        # Test delete_many()
+        cc.delete_many(dst_container, [append_file.name])
+        assert not cc.exists(dst_container, append_file.name), "File still exists after delete_many"
+
 